@@ -0,0 +1,42 @@
+"""
+Check that the DIRECT_COMMANDS table in main.py still matches the commands in cli.py.
+
+main.py runs these commands without loading cyclopts, so nothing else notices when a command body changes and the
+table does not. Run this after editing either file: uv run python scripts/check_direct_commands.py
+"""
+
+import sys
+
+from dojo_cli.cli import app
+from dojo_cli.main import DIRECT_COMMANDS
+
+def check_direct_command(name: str, module_name: str, function_name: str, args: tuple) -> list[str]:
+    try:
+        func = app[name].default_command
+    except KeyError:
+        return [f'{name} is not a registered command']
+    if func is None:
+        return [f'{name} has no command function']
+
+    problems = []
+    code = func.__code__
+    if code.co_argcount + code.co_kwonlyargcount:
+        problems.append(f'{name} takes parameters')
+    if not {module_name, function_name} <= set(code.co_names):
+        problems.append(f'{name} does not call {module_name}.{function_name}')
+    if not set(args) <= set(code.co_consts):
+        problems.append(f'{name} does not call {function_name} with {args}')
+    return problems
+
+def main():
+    problems = [
+        problem
+        for name, (module_name, function_name, args) in DIRECT_COMMANDS.items()
+        for problem in check_direct_command(name, module_name, function_name, args)
+    ]
+    for problem in problems:
+        print(problem, file=sys.stderr)
+    sys.exit(1 if problems else 0)
+
+if __name__ == '__main__':
+    main()
@@ -1,7 +1,12 @@
 """This is the package for the pwn.college dojo CLI."""
 
-from .cli import app
-
 __all__ = [
     'app'
 ]
+
+def __getattr__(name: str):
+    """Import the CLI app on first access, so importing a submodule doesn't also load cyclopts and every command."""
+    if name == 'app':
+        from .cli import app
+        return app
+    raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
@@ -1,7 +1,7 @@
 """This is here just so you can run `python -m dojo_cli` instead of `dojo` if you want to do that for some reason."""
 
 import sys
-from .cli import app
+from .main import main
 
 if __name__ == '__main__':
-    sys.exit(app())
+    sys.exit(main())
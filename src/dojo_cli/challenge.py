@@ -1,19 +1,18 @@
 """Handles challenge initialization and flag submission."""
 
-from bs4 import BeautifulSoup
-from itsdangerous import URLSafeSerializer
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 import os
 from pathlib import Path
 import re
-from rich.markdown import Markdown
 import string
 from typing import Optional
 
 from .client import get_remote_client
-from .http import request
+from .http import DOJOS_CACHE_TTL, get_account_id, get_cached_account_id, request, request_json_cached
 from .log import error, fail, info, success, warn
 from .terminal import apply_style
-from .utils import can_render_image, download_image, fix_markdown_links, get_belt_hex, show_table
+from .utils import can_render_image, download_images, fix_markdown_links, get_belt_hex, show_table
 
 DOJO_IDS = [
     'welcome',
@@ -38,38 +37,94 @@ DOJO_IDS = [
     'xnu'
 ]
 
+HTML_CHUNK_SIZE = 64 * 1024
+
+CHALLENGE_INIT_PATTERN = re.compile(
+    r'<input[^>]*\bid="challenge"[^>]*\bvalue="([^"]*)".*?<input[^>]*\bid="challenge-id"[^>]*\bvalue="(\d+)"',
+    re.DOTALL
+)
+CHALLENGE_PATH_PATTERN = re.compile(r'/?([\-\~\w]+)/([\-\w]+)/([\-\w]+)')
+CHALLENGE_SLUG_TABLE = str.maketrans('', '', string.ascii_letters + string.digits + '-_')
+FLAG_CHARS = '-0123456789ABCDEFGHIJKLMNOPQRSTUVWXYZ_abcdefghijklmnopqrstuvwxyz'
+FLAG_INNER_TABLE = str.maketrans('', '', string.ascii_letters + string.digits + '-._')
+FLAG_PREFIX = 'pwn.college{'
+FLAG_SUFFIX = '}'
+
+docker_cache: Optional[dict] = None
+
+def get_docker_state(force: bool = False) -> dict:
+    global docker_cache
+    if docker_cache is None or force:
+        docker_cache = request('/docker').json()
+    return docker_cache
+
+def clear_docker_cache():
+    global docker_cache
+    docker_cache = None
+
 def parse_challenge_path(challenge_id: str, chal_data: dict = {}) -> tuple:
-    if re.fullmatch(r'[\-\w]+', challenge_id):
+    if challenge_id and not challenge_id.translate(CHALLENGE_SLUG_TABLE):
         if not chal_data:
-            chal_data = request('/docker').json()
+            chal_data = get_docker_state()
         if chal_data.get('success'):
             return chal_data.get('dojo'), chal_data.get('module'), challenge_id
         return tuple()
 
-    result = re.findall(r'/?([\-\~\w]+)/([\-\w]+)/([\-\w]+)', challenge_id)
+    result = CHALLENGE_PATH_PATTERN.findall(challenge_id)
     return result[0] if result else tuple()
 
+@lru_cache(maxsize=64)
+def get_module_challenge_ids(dojo_id: str, module_id: str) -> dict[str, int]:
+    """Map each challenge ID in a module to its numeric challenge ID, parsed once from the module page."""
+
+    response = request(f'/{dojo_id}/{module_id}', False, False, stream=True)
+    response.encoding = response.encoding or 'utf-8'
+    html = ''
+    challenge_ids = {}
+
+    # Scan the page as it arrives, only keeping the part that has not matched yet
+    for chunk in response.iter_content(HTML_CHUNK_SIZE, decode_unicode=True):
+        html += chunk
+        end = 0
+        for match in CHALLENGE_INIT_PATTERN.finditer(html):
+            challenge_ids.setdefault(match.group(1), int(match.group(2)))
+            end = match.end()
+        html = html[end:]
+
+    if challenge_ids:
+        return challenge_ids
+
+    # Fall back to a full parse in case the page markup changes
+    from bs4 import BeautifulSoup
+    soup = BeautifulSoup(html, 'html.parser')
+    for challenge_div in soup.find_all('div', class_='challenge-init'):
+        input_challenge = challenge_div.find('input', id='challenge')
+        input_challenge_id = challenge_div.find('input', id='challenge-id')
+        if input_challenge and input_challenge_id:
+            challenge_ids.setdefault(str(input_challenge['value']), int(str(input_challenge_id['value'])))
+    return challenge_ids
+
 def get_challenge_num_id(dojo_id: Optional[str], module_id: Optional[str], challenge_id: Optional[str]) -> int:
     if dojo_id and module_id and challenge_id:
-        response = request(f'/{dojo_id}/{module_id}', False, False)
-        soup = BeautifulSoup(response.text, 'html.parser')
-        challenges = soup.find_all('div', class_='challenge-init')
-        for challenge_div in challenges:
-            input_challenge = challenge_div.find('input', id='challenge')
-            if input_challenge and input_challenge['value'] == challenge_id:
-                input_challenge_id = challenge_div.find('input', id='challenge-id')
-                if input_challenge_id:
-                    return int(str(input_challenge_id['value']))
+        return get_module_challenge_ids(dojo_id, module_id).get(challenge_id, -1)
     return -1
 
-def get_challenge_info(dojo_id: Optional[str] = None, module_id: Optional[str] = None, challenge_id: Optional[str] = None):
-    account_id = request('/users/me').json().get('id')
-    if account_id is None:
-        error('Please login first or run this in the dojo.')
+def is_current_challenge(chal_data: dict, dojo_id: Optional[str], module_id: Optional[str], challenge_id: Optional[str]) -> bool:
+    """Check whether the given challenge is the one currently running in normal mode."""
 
-    chal_data = request('/docker').json()
+    return (
+        chal_data.get('dojo') == dojo_id
+        and chal_data.get('module') == module_id
+        and chal_data.get('challenge') == challenge_id
+        and chal_data.get('practice') is False
+    )
+
+def get_challenge_info(dojo_id: Optional[str] = None, module_id: Optional[str] = None, challenge_id: Optional[str] = None):
+    # Check the session on this thread first, so an auth error is reported once instead of by every worker
+    chal_data = get_docker_state()
 
     if challenge_id:
+        account_id = get_account_id()
         if not dojo_id or not module_id:
             challenge_path = parse_challenge_path(challenge_id, chal_data)
             if len(challenge_path) == 3 and all(isinstance(s, str) for s in challenge_path):
@@ -86,20 +141,41 @@ def get_challenge_info(dojo_id: Optional[str] = None, module_id: Optional[str] =
         else:
             error('No active challenge session; please start a challenge or specify a challenge name!')
 
-        active_module = request('/active-module', False)
+        # The account ID is usually in the cookie jar, so only overlap the two requests when both are needed
+        account_id = get_cached_account_id()
+        if account_id is None:
+            with ThreadPoolExecutor(2) as executor:
+                account_future = executor.submit(get_account_id)
+                active_module_future = executor.submit(request, '/active-module', False)
+            account_id = account_future.result()
+            active_module = active_module_future.result()
+        else:
+            active_module = request('/active-module', False)
         if active_module.is_redirect:
             challenge_num_id = get_challenge_num_id(dojo_id, module_id, challenge_id)
         else:
             challenge_num_id = active_module.json().get('c_current', {}).get('challenge_id', -1)
 
-    return (dojo_id, module_id, challenge_id), (account_id, challenge_num_id)
+    if account_id is None:
+        error('Please login first or run this in the dojo.')
+    return (dojo_id, module_id, challenge_id), (account_id, challenge_num_id), chal_data
+
+def is_flag_inner(flag: str) -> bool:
+    return bool(flag) and not flag.translate(FLAG_INNER_TABLE)
 
+@lru_cache(maxsize=32)
 def serialize_flag(account_id: int, challenge_id: int) -> str:
+    from itsdangerous import URLSafeSerializer
     return URLSafeSerializer('').dumps([account_id, challenge_id])[::-1]
 
 def deserialize_flag(flag: str) -> Optional[list[int]]:
-    return URLSafeSerializer('').loads_unsafe(re.sub('.+?{(.+)}', r'\1', flag)[::-1])[1]
+    from itsdangerous import URLSafeSerializer
+    left_brace, right_brace = flag.find('{'), flag.rfind('}')
+    if left_brace != -1 and right_brace > left_brace:
+        flag = flag[left_brace + 1:right_brace]
+    return URLSafeSerializer('').loads_unsafe(flag[::-1])[1]
 
+@lru_cache(maxsize=1)
 def get_flag_size() -> int:
     flag_path = Path('/flag')
 
@@ -109,7 +185,7 @@ def get_flag_size() -> int:
         else:
             error('Flag file does not exist.')
 
-    elif request('/docker').json().get('success'):
+    elif get_docker_state().get('success'):
         flag_size = get_remote_client().getsize(str(flag_path))
         if flag_size == -1:
             error('Flag file does not exist.')
@@ -120,57 +196,72 @@ def get_flag_size() -> int:
 
     return -1
 
+@lru_cache(maxsize=2)
+def get_dojos(auth: bool = False) -> list[dict]:
+    if auth:
+        return request('/dojos').json().get('dojos')
+    return request_json_cached('/dojos', DOJOS_CACHE_TTL).get('dojos')
+
+@lru_cache(maxsize=16)
+def get_dojo_modules(dojo_id: str, auth: bool = False) -> list[dict]:
+    if auth:
+        return request(f'/dojos/{dojo_id}/modules').json().get('modules')
+    return request_json_cached(f'/dojos/{dojo_id}/modules', DOJOS_CACHE_TTL).get('modules')
+
+@lru_cache(maxsize=16)
+def get_dojo_modules_by_id(dojo_id: str, auth: bool = False) -> dict[str, dict]:
+    return {module['id']: module for module in get_dojo_modules(dojo_id, auth)}
+
+def get_dojo_award(award: Optional[dict], belt_images: dict):
+    if not award:
+        return None
+    elif 'belt' in award:
+        belt_url = f'/belt/{award['belt']}.svg'
+        if belt_url in belt_images:
+            return belt_images[belt_url]
+        return f'[b {get_belt_hex(award['belt'])}]{award['belt'].title()} Belt[/]'
+    elif 'emoji' in award:
+        return award['emoji']
+
 def show_list(dojo_id: Optional[str] = None, module_id: Optional[str] = None, challenge_id: Optional[str] = None, auth: bool = False, official: bool = False, simple: bool = False):
+    from rich.markdown import Markdown
+
     if not dojo_id:
-        dojos = request('/dojos', auth=auth).json().get('dojos')
+        dojos = get_dojos(auth)
         sorted_dojos = sorted(filter(lambda dojo: dojo['id'] in DOJO_IDS, dojos), key=lambda dojo: DOJO_IDS.index(dojo['id']))
         sorted_dojos += sorted(filter(lambda dojo: dojo['id'] not in DOJO_IDS, dojos), key=lambda dojo: dojo['id'])
         if official:
             sorted_dojos = filter(lambda dojo: dojo['official'], sorted_dojos)
 
-        render_image = not simple and can_render_image()
-        table_data = []
+        sorted_dojos = list(sorted_dojos)
+        belt_images = {}
+        if not simple and can_render_image():
+            belts = [dojo['award']['belt'] for dojo in sorted_dojos if dojo['award'] and 'belt' in dojo['award']]
+            belt_images = download_images(f'/belt/{belt}.svg' for belt in belts)
+
         table_title = 'List of Dojos'
         table_keys = ['id', 'award', 'name', 'description', 'modules', 'challenges']
-
-        for dojo in sorted_dojos:
-            if not dojo['award']:
-                award = None
-            elif 'belt' in dojo['award']:
-                if render_image:
-                    award = download_image(f'/belt/{dojo['award']['belt']}.svg')
-                else:
-                    belt_hex = get_belt_hex(dojo['award']['belt'])
-                    award = f'[b {belt_hex}]{dojo['award']['belt'].title()} Belt[/]'
-            elif 'emoji' in dojo['award']:
-                award = dojo['award']['emoji']
-
-            table_data.append({
-                'id': f'[b cyan]{dojo['id']}[/]',
-                'award': award,
-                'name': f'[b green]{dojo['name']}[/]',
-                'description': Markdown(fix_markdown_links(dojo['description'])) if dojo['description'] else None,
-                'modules': dojo['modules_count'],
-                'challenges': dojo['challenges_count']
-            })
+        table_data = [{
+            'id': f'[b cyan]{dojo['id']}[/]',
+            'award': get_dojo_award(dojo['award'], belt_images),
+            'name': f'[b green]{dojo['name']}[/]',
+            'description': Markdown(fix_markdown_links(dojo['description'])) if dojo['description'] else None,
+            'modules': dojo['modules_count'],
+            'challenges': dojo['challenges_count']
+        } for dojo in sorted_dojos]
 
     elif not module_id:
-        modules = request(f'/dojos/{dojo_id}/modules', auth=auth).json().get('modules')
-        table_data = []
         table_title = f'List of Modules in {dojo_id}'
         table_keys = ['id', 'name', 'description']
-
-        for module in modules:
-            table_data.append({
-                'id': f'[b cyan]{module['id']}[/]',
-                'name': f'[b green]{module['name']}[/]',
-                'description': Markdown(fix_markdown_links(module['description'])) if module['description'] else None
-            })
+        table_data = [{
+            'id': f'[b cyan]{module['id']}[/]',
+            'name': f'[b green]{module['name']}[/]',
+            'description': Markdown(fix_markdown_links(module['description'])) if module['description'] else None
+        } for module in get_dojo_modules(dojo_id, auth)]
 
     elif not challenge_id:
-        modules = request(f'/dojos/{dojo_id}/modules', auth=auth).json().get('modules')
-        module = next(filter(lambda module: module['id'] == module_id, modules))
-        resources = list(filter(lambda resource: resource['type'] != 'header', module['resources']))
+        module = get_dojo_modules_by_id(dojo_id, auth)[module_id]
+        resources = [dict(resource) for resource in module['resources'] if resource['type'] != 'header']
 
         if resources:
             resource_title = f'List of Resources in {dojo_id}/{module_id}'
@@ -195,31 +286,29 @@ def show_list(dojo_id: Optional[str] = None, module_id: Optional[str] = None, ch
                 resource['type'] = resource['type'].title()
             show_table(resources, resource_title, resource_keys, show_lines=True)
 
-        table_data = []
         table_title = f'List of Challenges in {dojo_id}/{module_id}'
         table_keys = ['id', 'name', 'description']
+        table_data = [{
+            'id': f'[b cyan]{challenge['id']}[/]',
+            'name': f'[b green]{challenge['name']}[/]',
+            'description': Markdown(fix_markdown_links(challenge['description'])) if challenge['description'] else None
+        } for challenge in module['challenges']]
 
-        for challenge in module['challenges']:
-            table_data.append({
-                'id': f'[b cyan]{challenge['id']}[/]',
-                'name': f'[b green]{challenge['name']}[/]',
-                'description': Markdown(fix_markdown_links(challenge['description'])) if challenge['description'] else None
-            })
     else:
-        modules = request(f'/dojos/{dojo_id}/modules', auth=auth).json().get('modules')
-        challenges = next(filter(lambda module: module['id'] == module_id, modules)).get('challenges')
-        table_data = next(filter(lambda challenge: challenge['id'] == challenge_id, challenges))
+        challenges = get_dojo_modules_by_id(dojo_id, auth)[module_id].get('challenges')
+        challenge = next(filter(lambda challenge: challenge['id'] == challenge_id, challenges))
         table_title = f'Challenge Info for {dojo_id}/{module_id}/{challenge_id}'
         table_keys = ['id', 'name', 'description']
-
-        table_data['id'] = f'[b cyan]{table_data['id']}[/]'
-        table_data['name'] = f'[b green]{table_data['name']}[/]'
-        table_data['description'] = Markdown(fix_markdown_links(table_data['description'])) if table_data['description'] else None
+        table_data = {
+            'id': f'[b cyan]{challenge['id']}[/]',
+            'name': f'[b green]{challenge['name']}[/]',
+            'description': Markdown(fix_markdown_links(challenge['description'])) if challenge['description'] else None
+        }
 
     show_table(table_data, table_title, table_keys, show_lines=True)
 
 def init_challenge(dojo_id: Optional[str] = None, module_id: Optional[str] = None, challenge_id: Optional[str] = None, normal: bool = False, privileged: bool = False):
-    chal_data = request('/docker').json()
+    chal_data = get_docker_state()
 
     if not challenge_id:
         if chal_data['success']:
@@ -245,7 +334,10 @@ def init_challenge(dojo_id: Optional[str] = None, module_id: Optional[str] = Non
 
     chal_data = {'dojo': dojo_id, 'module': module_id, 'challenge': challenge_id, 'practice': practice}
     docker_response = request('/docker', csrf=True, json=chal_data).json()
+    clear_docker_cache()
     if docker_response.get('success'):
+        get_flag_size.cache_clear()
+        get_module_challenge_ids.cache_clear()
         success('Challenge started successfully!')
     elif docker_response.get('error'):
         error(docker_response['error'])
@@ -253,7 +345,7 @@ def init_challenge(dojo_id: Optional[str] = None, module_id: Optional[str] = Non
         error('Failed to start challenge.')
 
 def init_next(normal: bool = False, privileged: bool = False):
-    if not request('/docker').json().get('success'):
+    if not get_docker_state().get('success'):
         error('No active challenge session; start a challenge!')
 
     active_module = request('/active-module', False)
@@ -267,7 +359,7 @@ def init_next(normal: bool = False, privileged: bool = False):
         warn('This is the last challenge in the module.')
 
 def init_previous(normal: bool = False, privileged: bool = False):
-    if not request('/docker').json().get('success'):
+    if not get_docker_state().get('success'):
         error('No active challenge session; start a challenge!')
 
     active_module = request('/active-module', False)
@@ -281,54 +373,52 @@ def init_previous(normal: bool = False, privileged: bool = False):
         warn('This is the first challenge in the module.')
 
 def restart_challenge(normal: bool = False, privileged: bool = False):
-    if not request('/docker').json().get('success'):
+    if not get_docker_state().get('success'):
         error('No active challenge session; start a challenge!')
 
     init_challenge(normal=normal, privileged=privileged)
 
 def stop_challenge():
     docker_response = request('/docker', csrf=True, method='DELETE', json={}).json()
+    clear_docker_cache()
     if docker_response.get('success'):
+        get_flag_size.cache_clear()
         success(docker_response.get('message', 'Challenge stopped successfully!'))
     else:
         error(docker_response.get('error', 'Challenge stopped unsuccessfully.'))
 
 def show_status():
-    docker_response = request('/docker').json()
+    docker_response = get_docker_state()
     if docker_response.get('success'):
-        docker_response.pop('success')
-        show_table(docker_response, 'Challenge Status')
+        show_table({key: value for key, value in docker_response.items() if key != 'success'}, 'Challenge Status')
     else:
         fail(docker_response.get('error'))
 
 def show_hint(dojo_id: Optional[str] = None, module_id: Optional[str] = None, challenge_id: Optional[str] = None):
-    (dojo_id, module_id, challenge_id), (account_id, challenge_num_id) = get_challenge_info(dojo_id, module_id, challenge_id)
+    (dojo_id, module_id, challenge_id), (account_id, challenge_num_id), chal_data = get_challenge_info(dojo_id, module_id, challenge_id)
 
     fake_flag = serialize_flag(account_id, challenge_num_id)
-    flag_prefix = 'pwn.college{'
     flag_suffix = fake_flag[fake_flag.index('.'):] + '}'
-    info(f'The flag starts with: [b cyan]{flag_prefix}[/]')
+    info(f'The flag starts with: [b cyan]{FLAG_PREFIX}[/]')
     info(f'The flag ends with: [b cyan]{flag_suffix}[/]')
-    flag_chars = ''.join(sorted(string.digits + string.ascii_letters + '-_'))
-    info(f'The middle of the flag can only be these characters: [b cyan]{flag_chars}[/]')
+    info(f'The middle of the flag can only be these characters: [b cyan]{FLAG_CHARS}[/]')
 
-    chal_data = request('/docker').json()
-    if list(map(chal_data.get, ['dojo', 'module', 'challenge', 'practice'])) == [dojo_id, module_id, challenge_id, False]:
+    if is_current_challenge(chal_data, dojo_id, module_id, challenge_id):
         flag_length = get_flag_size() - 1
         flag_path = Path('/flag')
         warn(f'The following information assumes that {apply_style(flag_path)} has not been tampered with:')
         info(f'Excluding the final newline, the flag is {flag_length} characters long.')
-        middle_count = flag_length - len(flag_prefix) - len(flag_suffix)
+        middle_count = flag_length - len(FLAG_PREFIX) - len(flag_suffix)
         info(f'You only need to figure out the middle {middle_count} characters of the flag.')
 
     else:
-        flag_length = len(f'pwn.college{{{fake_flag}}}')
+        flag_length = len(FLAG_PREFIX) + len(fake_flag) + len(FLAG_SUFFIX)
         warn('You are not running the correct challenge in normal mode, so the real flag size cannot be measured.')
         info(f'Excluding the final newline, the flag is about {flag_length} characters long.')
         info(f'You would only need to figure out the middle {fake_flag.index('.')} characters of the flag.')
 
 def submit_flag(flag: Optional[str] = None, dojo_id: Optional[str] = None, module_id: Optional[str] = None, challenge_id: Optional[str] = None):
-    (dojo_id, module_id, challenge_id), (account_id, challenge_num_id) = get_challenge_info(dojo_id, module_id, challenge_id)
+    (dojo_id, module_id, challenge_id), (account_id, challenge_num_id), chal_data = get_challenge_info(dojo_id, module_id, challenge_id)
 
     while not flag:
         flag = input('Enter the flag: ').strip()
@@ -340,36 +430,33 @@ def submit_flag(flag: Optional[str] = None, dojo_id: Optional[str] = None, modul
         return
 
     payload = deserialize_flag(flag)
+    warnings = []
 
     if isinstance(payload, list) and len(payload) == 2 and all(isinstance(i, int) for i in payload):
         if payload[0] != account_id:
-            warn('This flag is from another account! Are you sure you want to submit?')
-            if input('(y/N) > ').strip()[:1].lower() != 'y':
-                warn('Aborting flag submission attempt!')
-                return
-
+            warnings.append('This flag is from another account!')
         if payload[1] != challenge_num_id:
-            warn('This flag is from another challenge! Are you sure you want to submit?')
-            if input('(y/N) > ').strip()[:1].lower() != 'y':
-                warn('Aborting flag submission attempt!')
-                return
+            warnings.append('This flag is from another challenge!')
 
-        chal_data = request('/docker').json()
-        if list(map(chal_data.get, ['dojo', 'module', 'challenge', 'practice'])) == [dojo_id, module_id, challenge_id, False]:
+        if is_current_challenge(chal_data, dojo_id, module_id, challenge_id):
             flag_length = get_flag_size() - 1
         else:
-            flag_length = len(f'pwn.college{{{serialize_flag(account_id, challenge_num_id)}}}')
+            flag_length = len(FLAG_PREFIX) + len(serialize_flag(account_id, challenge_num_id)) + len(FLAG_SUFFIX)
 
-        full_flag_mismatch = re.fullmatch(r'pwn.college{[\-\.\w]+}', flag) and len(flag) != flag_length
-        partial_flag_mismatch = re.fullmatch(r'[\-\.\w]+', flag) and len(f'pwn.college{{{flag}}}') != flag_length
+        is_full_flag = flag.startswith(FLAG_PREFIX) and flag.endswith(FLAG_SUFFIX) and is_flag_inner(flag[len(FLAG_PREFIX):-len(FLAG_SUFFIX)])
+        full_flag_mismatch = is_full_flag and len(flag) != flag_length
+        partial_flag_mismatch = is_flag_inner(flag) and len(FLAG_PREFIX) + len(flag) + len(FLAG_SUFFIX) != flag_length
         if full_flag_mismatch or partial_flag_mismatch:
-            warn(f'This flag is the wrong size! The real flag length is {flag_length}. Are you sure you want to submit?')
-            if input('(y/N) > ').strip()[:1].lower() != 'y':
-                warn('Aborting flag submission attempt!')
-                return
+            warnings.append(f'This flag is the wrong size! The real flag length is {flag_length}.')
 
     else:
-        warn('Could not deserialize flag. Are you sure you want to submit?')
+        warnings.append('Could not deserialize flag.')
+
+    # Ask once about everything that looks wrong, instead of once per check
+    if warnings:
+        for message in warnings[:-1]:
+            warn(message)
+        warn(f'{warnings[-1]} Are you sure you want to submit?')
         if input('(y/N) > ').strip()[:1].lower() != 'y':
             warn('Aborting flag submission attempt!')
             return
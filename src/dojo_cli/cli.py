@@ -4,15 +4,18 @@
 # TODO: resolve dict.get(key) vs dict[key]
 # Caveat: this CLI is designed for Linux remote challenges, might work for Mac challenges idk
 
+import os
 from pathlib import Path
 from typing import Annotated, Optional
 
 from cyclopts import App, Group, Parameter, validators
-from cyclopts.types import ResolvedDirectory, ResolvedExistingFile, ResolvedPath
+from cyclopts.types import ResolvedDirectory, ResolvedExistingPath, ResolvedPath
 
-from .config import DEFAULT_CONFIG_PATH
+from .constants import DEFAULT_CONFIG_PATH
 
 DEFAULT_SENSAI_TIMEOUT = 60.0
+DU_COMMAND = 'find {path} -type f -printf "%k\\t%p\\n" 2>/dev/null | sort -rn | head -n {count} | numfmt --from-unit=1024 --to=iec'
+DUST_COMMAND = 'dust -CFprsx -n {count} {path} 2>/dev/null'
 
 app = App(
     name='dojo',
@@ -26,9 +29,22 @@ app = App(
     default_parameter=Parameter(negative=())
 )
 
+def command(name: Optional[str] = None, **kwargs):
+    """Register a function as a command by its import path, so cyclopts only builds the command that gets invoked."""
+    def register(func):
+        app.command(f'{__name__}:{func.__name__}', name, help=func.__doc__, **kwargs)
+        return func
+    return register
+
+DojoOption = Annotated[Optional[str], Parameter(name='--dojo', alias='-d')]
+ModuleOption = Annotated[Optional[str], Parameter(name='--module', alias='-m')]
+ChallengeOption = Annotated[Optional[str], Parameter(name='--challenge', alias='-c')]
+SimpleOption = Annotated[bool, Parameter(alias='-s')]
+MountPointOption = Annotated[Optional[ResolvedDirectory], Parameter(name='--point', alias='-p')]
+
 user_login = Group.create_ordered('User Login and Settings')
 
-@app.command(group=user_login)
+@command(group=user_login)
 def register(*,
     username: Annotated[Optional[str], Parameter(alias='-u')] = None,
     email: Annotated[Optional[str], Parameter(alias='-e')] = None,
@@ -45,7 +61,7 @@ def register(*,
     from .user import do_register
     do_register(username, email, password)
 
-@app.command(group=user_login)
+@command(group=user_login)
 def login(*,
     username: Annotated[Optional[str], Parameter(alias='-u')] = None,
     password: Annotated[Optional[str], Parameter(alias='-p')] = None
@@ -60,19 +76,19 @@ def login(*,
     from .user import do_login
     do_login(username, password)
 
-@app.command(group=user_login)
+@command(group=user_login)
 def logout():
     """Log out of your pwn.college account by deleting session cookie from the cache."""
     from .user import do_logout
     do_logout()
 
-@app.command(group=user_login)
+@command(group=user_login)
 def settings():
     """Change the settings of your pwn.college account."""
     from .user import change_settings
     change_settings()
 
-@app.command(group=user_login)
+@command(group=user_login)
 def keygen():
     """Generate an SSH key for the dojo and add it to user settings."""
     from .remote import ssh_keygen
@@ -80,8 +96,8 @@ def keygen():
 
 user_info = Group.create_ordered('User Info')
 
-@app.command(alias=('me', 'profile'), group=user_info)
-def whoami(*, simple: Annotated[bool, Parameter(alias='-s')] = False):
+@command(alias=('me', 'profile'), group=user_info)
+def whoami(*, simple: SimpleOption = False):
     """
     Show information about the current user (you!)
 
@@ -91,7 +107,7 @@ def whoami(*, simple: Annotated[bool, Parameter(alias='-s')] = False):
     from .user import show_me
     show_me(simple)
 
-@app.command(alias=('rank', 'score'), group=user_info)
+@command(alias=('rank', 'score'), group=user_info)
 def whois(*, username: Annotated[Optional[str], Parameter(alias='-u')] = None):
     """
     Show global ranking for another user. If no username is given, show the current user's ranking.
@@ -102,7 +118,7 @@ def whois(*, username: Annotated[Optional[str], Parameter(alias='-u')] = None):
     from .user import show_score
     show_score(username)
 
-@app.command(group=user_info)
+@command(group=user_info)
 def activity(*, user_id: Annotated[Optional[int], Parameter(name='--id', alias='-i')] = None):
     """
     Show activity for another user. If no user ID is given, show the current user's activity.
@@ -113,13 +129,13 @@ def activity(*, user_id: Annotated[Optional[int], Parameter(name='--id', alias='
     from .user import show_activity
     show_activity(user_id)
 
-@app.command(group=user_info)
+@command(group=user_info)
 def scoreboard(*,
-    dojo_id: Annotated[Optional[str], Parameter(name='--dojo', alias='-d')] = None,
-    module_id: Annotated[Optional[str], Parameter(name='--module', alias='-m')] = None,
+    dojo_id: DojoOption = None,
+    module_id: ModuleOption = None,
     duration: Annotated[str, Parameter(alias='-t')] = 'all',
     page: Annotated[int, Parameter(alias='-p')] = 1,
-    simple: Annotated[bool, Parameter(alias='-s')] = False
+    simple: SimpleOption = False
 ):
     """
     Show scoreboard for a dojo or module. If no dojo is given, show WeChall global scoreboard.
@@ -134,11 +150,11 @@ def scoreboard(*,
     from .user import show_scoreboard
     show_scoreboard(dojo_id, module_id, duration, page, simple)
 
-@app.command(group=user_info)
+@command(group=user_info)
 def belts(*,
     belt: Annotated[Optional[str], Parameter(name='--color', alias='-c')] = None,
     page: Annotated[Optional[int], Parameter(alias='-p')] = None,
-    simple: Annotated[bool, Parameter(alias='-s')] = False
+    simple: SimpleOption = False
 ):
     """
     Show all the users who have earned belts above white belt.
@@ -153,14 +169,14 @@ def belts(*,
 
 challenge_info = Group.create_ordered('Challenge Info')
 
-@app.command(name='list', alias='ls', group=challenge_info)
+@command(name='list', alias='ls', group=challenge_info)
 def ls(*,
-    dojo_id: Annotated[Optional[str], Parameter(name='--dojo', alias='-d')] = None,
-    module_id: Annotated[Optional[str], Parameter(name='--module', alias='-m')] = None,
-    challenge_id: Annotated[Optional[str], Parameter(name='--challenge', alias='-c')] = None,
+    dojo_id: DojoOption = None,
+    module_id: ModuleOption = None,
+    challenge_id: ChallengeOption = None,
     auth: Annotated[bool, Parameter(alias='-a')] = False,
     official: Annotated[bool, Parameter(alias='-o')] = False,
-    simple: Annotated[bool, Parameter(alias='-s')] = False
+    simple: SimpleOption = False
 ):
     """
     List the members of a dojo or module. If no dojo is given, display all dojos.
@@ -176,11 +192,11 @@ def ls(*,
     from .challenge import show_list
     show_list(dojo_id, module_id, challenge_id, auth, official, simple)
 
-@app.command(group=challenge_info)
+@command(group=challenge_info)
 def tree(*,
-    dojo_id: Annotated[Optional[str], Parameter(name='--dojo', alias='-d')] = None,
-    module_id: Annotated[Optional[str], Parameter(name='--module', alias='-m')] = None,
-    challenge_id: Annotated[Optional[str], Parameter(name='--challenge', alias='-c')] = None,
+    dojo_id: DojoOption = None,
+    module_id: ModuleOption = None,
+    challenge_id: ChallengeOption = None,
     auth: Annotated[bool, Parameter(alias='-a')] = False,
     official: Annotated[bool, Parameter(alias='-o')] = False
 ):
@@ -199,21 +215,21 @@ def tree(*,
 
 video_playback = Group.create_ordered('Video Streaming and Playback')
 
-@app.command(alias='ttv', group=video_playback)
+@command(alias='ttv', group=video_playback)
 def twitch():
     """Play the pwn.college live stream on Twitch."""
     from .video import init_twitch
     init_twitch()
 
-@app.command(alias='yt', group=video_playback)
+@command(alias='yt', group=video_playback)
 def youtube(*,
     video_id: Annotated[Optional[str], Parameter(name='--video', alias='-v')] = None,
     playlist_id: Annotated[Optional[str], Parameter(name='--playlist', alias='-p')] = None,
-    dojo_id: Annotated[Optional[str], Parameter(name='--dojo', alias='-d')] = None,
-    module_id: Annotated[Optional[str], Parameter(name='--module', alias='-m')] = None,
+    dojo_id: DojoOption = None,
+    module_id: ModuleOption = None,
     resource_id: Annotated[Optional[str], Parameter(name='--resource', alias='-r')] = None,
     page: Annotated[Optional[int], Parameter(alias='-n')] = None,
-    simple: Annotated[bool, Parameter(alias='-s')] = False
+    simple: SimpleOption = False
 ):
     """
     Play a lecture on YouTube.
@@ -232,14 +248,16 @@ def youtube(*,
 
 challenge_launch = Group.create_ordered('Challenge Launch')
 challenge_mode = Group(validator=validators.mutually_exclusive)
+NormalOption = Annotated[bool, Parameter(alias='-n', group=challenge_mode)]
+PrivilegedOption = Annotated[bool, Parameter(alias=('--practice', '-p'), group=challenge_mode)]
 
-@app.command(group=challenge_launch)
+@command(group=challenge_launch)
 def start(*,
-    dojo_id: Annotated[Optional[str], Parameter(name='--dojo', alias='-d')] = None,
-    module_id: Annotated[Optional[str], Parameter(name='--module', alias='-m')] = None,
-    challenge_id: Annotated[Optional[str], Parameter(name='--challenge', alias='-c')] = None,
-    normal: Annotated[bool, Parameter(alias='-n', group=challenge_mode)] = False,
-    privileged: Annotated[bool, Parameter(alias=('--practice', '-p'), group=challenge_mode)] = False
+    dojo_id: DojoOption = None,
+    module_id: ModuleOption = None,
+    challenge_id: ChallengeOption = None,
+    normal: NormalOption = False,
+    privileged: PrivilegedOption = False
 ):
     """
     Start a new challenge. The challenge ID can either be by itself or in the format `<dojo>/<module>/<challenge>`.
@@ -260,10 +278,10 @@ def start(*,
     from .challenge import init_challenge
     init_challenge(dojo_id, module_id, challenge_id, normal, privileged)
 
-@app.command(name='next', group=challenge_launch)
+@command(name='next', group=challenge_launch)
 def start_next(*,
-    normal: Annotated[bool, Parameter(alias='-n', group=challenge_mode)] = False,
-    privileged: Annotated[bool, Parameter(alias=('--practice', '-p'), group=challenge_mode)] = False
+    normal: NormalOption = False,
+    privileged: PrivilegedOption = False
 ):
     """
     Start the next challenge in the current module.
@@ -275,10 +293,10 @@ def start_next(*,
     from .challenge import init_next
     init_next(normal, privileged)
 
-@app.command(alias='prev', group=challenge_launch)
+@command(alias='prev', group=challenge_launch)
 def previous(*,
-    normal: Annotated[bool, Parameter(alias='-n', group=challenge_mode)] = False,
-    privileged: Annotated[bool, Parameter(alias=('--practice', '-p'), group=challenge_mode)] = False
+    normal: NormalOption = False,
+    privileged: PrivilegedOption = False
 ):
     """
     Start the previous challenge in the current module.
@@ -290,10 +308,10 @@ def previous(*,
     from .challenge import init_previous
     init_previous(normal, privileged)
 
-@app.command(group=challenge_launch)
+@command(group=challenge_launch)
 def restart(*,
-    normal: Annotated[bool, Parameter(alias='-n', group=challenge_mode)] = False,
-    privileged: Annotated[bool, Parameter(alias=('--practice', '-p'), group=challenge_mode)] = False
+    normal: NormalOption = False,
+    privileged: PrivilegedOption = False
 ):
     """
     Restart the current challenge. This will restart in the current mode by default.
@@ -305,7 +323,7 @@ def restart(*,
     from .challenge import restart_challenge
     restart_challenge(normal, privileged)
 
-@app.command(group=challenge_launch)
+@command(group=challenge_launch)
 def stop():
     """Stop the current challenge."""
     from .challenge import stop_challenge
@@ -313,7 +331,7 @@ def stop():
 
 challenge_status = Group.create_ordered('Challenge Status')
 
-@app.command(alias='ps', group=challenge_status)
+@command(alias='ps', group=challenge_status)
 def status():
     """Show the status of the current challenge."""
     from .challenge import show_status
@@ -321,13 +339,13 @@ def status():
 
 remote_connection = Group.create_ordered('Remote Connection')
 
-@app.command(group=remote_connection)
+@command(group=remote_connection)
 def connect():
     """Connect to the current challenge via an interactive remote shell (bash by default)."""
     from .remote import run_cmd
     run_cmd()
 
-@app.command(group=remote_connection)
+@command(group=remote_connection)
 def bash(*, command_string: Annotated[Optional[str], Parameter(name='-c')] = None):
     """
     Connect to the current challenge via a bash login shell.
@@ -338,7 +356,7 @@ def bash(*, command_string: Annotated[Optional[str], Parameter(name='-c')] = Non
     from .shell import init_bash
     init_bash(command_string)
 
-@app.command(group=remote_connection)
+@command(group=remote_connection)
 def fish(*,
     command: Annotated[Optional[str], Parameter(alias='-c')] = None,
     init_command: Annotated[Optional[str], Parameter(alias='-C')] = None
@@ -353,7 +371,7 @@ def fish(*,
     from .shell import init_fish
     init_fish(command, init_command)
 
-@app.command(group=remote_connection)
+@command(group=remote_connection)
 def nu(*,
     commands: Annotated[Optional[str], Parameter(alias='-c')] = None,
     exec_commands: Annotated[Optional[str], Parameter(name='--execute', alias='-e')] = None
@@ -368,19 +386,19 @@ def nu(*,
     from .shell import init_nu
     init_nu(commands, exec_commands)
 
-@app.command(group=remote_connection)
+@command(group=remote_connection)
 def tmux():
     """Connect to the current challenge via a tmux login shell."""
     from .remote import run_cmd
     run_cmd('tmux -l')
 
-@app.command(group=remote_connection)
+@command(group=remote_connection)
 def zellij():
     """Connect to the current challenge via zellij."""
     from .remote import run_cmd
     run_cmd('zellij')
 
-@app.command(group=remote_connection)
+@command(group=remote_connection)
 def zsh(*, command: Annotated[Optional[str], Parameter(name='-c')] = None):
     """
     Connect to the current challenge via a zsh login shell.
@@ -393,7 +411,7 @@ def zsh(*, command: Annotated[Optional[str], Parameter(name='-c')] = None):
 
 remote_execution = Group.create_ordered('Remote Execution')
 
-@app.command(alias=('ssh', 'exec'), group=remote_execution)
+@command(alias=('ssh', 'exec'), group=remote_execution)
 def run(command: Optional[str] = None, /):
     """
     Execute a remote command. If no command is given, start a shell like `connect`.
@@ -404,22 +422,22 @@ def run(command: Optional[str] = None, /):
     from .remote import run_cmd
     run_cmd(command)
 
-@app.command(group=remote_execution)
+@command(group=remote_execution)
 def du(*,
     path: Annotated[Optional[Path], Parameter(alias='-p')] = None,
     count: Annotated[int, Parameter(name='--lines', alias='-n')] = 20
 ):
     """
-    List the largest files in a directory, using `du`. Helpful when clearing up space.
+    List the largest files in a directory, using `find`. Helpful when clearing up space.
 
     Args:
         path (Optional[Path]): Path to list files from.
         count (int): Number of files to display.
     """
     from .remote import run_cmd
-    run_cmd(f'find {path or '~'} -type f -exec du -hs {{}} + 2>/dev/null | sort -hr | head -n {count}')
+    run_cmd(DU_COMMAND.format(path=os.fspath(path) if path else '~', count=count))
 
-@app.command(group=remote_execution)
+@command(group=remote_execution)
 def dust(*,
     path: Annotated[Optional[Path], Parameter(alias='-p')] = None,
     count: Annotated[int, Parameter(name='--lines', alias='-n')] = 20
@@ -432,11 +450,11 @@ def dust(*,
         count (int): Number of files to display.
     """
     from .remote import run_cmd
-    run_cmd(f'dust -CFprsx -n {count} {path or '~'} 2>/dev/null')
+    run_cmd(DUST_COMMAND.format(path=os.fspath(path) if path else '~', count=count))
 
 remote_transfer = Group.create_ordered('Remote Transfer')
 
-@app.command(group=remote_transfer)
+@command(group=remote_transfer)
 def bat(path: Path, /):
     """
     Print the contents of a remote file to standard out using `bat`.
@@ -447,7 +465,7 @@ def bat(path: Path, /):
     from .remote import bat_file
     bat_file(path)
 
-@app.command(group=remote_transfer)
+@command(group=remote_transfer)
 def cat(path: Path, /):
     """
     Print the contents of a remote file to standard out.
@@ -458,27 +476,27 @@ def cat(path: Path, /):
     from .remote import print_file
     print_file(path)
 
-@app.command(alias='down', group=remote_transfer)
+@command(alias='down', group=remote_transfer)
 def download(remote_path: Path, local_path: Optional[ResolvedPath] = None, /):
     """
-    Download a file from remote to local.
-    By default, it downloads the file to the current working directory.
+    Download a file or directory from remote to local.
+    By default, it downloads to the current working directory.
 
     Args:
-        remote_path (Path): Path of remote file.
+        remote_path (Path): Path of remote file or directory.
         local_path (Optional[ResolvedPath]): Path of local directory or file.
     """
     from .remote import download_file
     download_file(remote_path, local_path)
 
-@app.command(alias='up', group=remote_transfer)
-def upload(local_path: ResolvedExistingFile, remote_path: Optional[Path] = None, /):
+@command(alias='up', group=remote_transfer)
+def upload(local_path: ResolvedExistingPath, remote_path: Optional[Path] = None, /):
     """
-    Upload a file from local to remote.
-    By default, it uploads the file to the configured SSH project path.
+    Upload a file or directory from local to remote.
+    By default, it uploads to the configured SSH project path.
 
     Args:
-        local_path (ResolvedExistingFile): Path of local file.
+        local_path (ResolvedExistingPath): Path of local file or directory.
         remote_path (Optional[Path]): Path of remote directory or file.
     """
     from .remote import upload_file
@@ -486,8 +504,8 @@ def upload(local_path: ResolvedExistingFile, remote_path: Optional[Path] = None,
 
 remote_mount = Group.create_ordered('Remote Mounting')
 
-@app.command(group=remote_mount)
-def mount(*, mount_point: Annotated[Optional[ResolvedDirectory], Parameter(name='--point', alias='-p')] = None):
+@command(group=remote_mount)
+def mount(*, mount_point: MountPointOption = None):
     """
     Mount the configured remote project path locally onto the specified mount point.
 
@@ -499,8 +517,8 @@ def mount(*, mount_point: Annotated[Optional[ResolvedDirectory], Parameter(name=
     from .editor import mount_remote
     mount_remote(mount_point)
 
-@app.command(alias='umount', group=remote_mount)
-def unmount(*, mount_point: Annotated[Optional[ResolvedDirectory], Parameter(name='--point', alias='-p')] = None):
+@command(alias='umount', group=remote_mount)
+def unmount(*, mount_point: MountPointOption = None):
     """
     Unmount the filesystem at the specified mount point.
 
@@ -514,11 +532,11 @@ def unmount(*, mount_point: Annotated[Optional[ResolvedDirectory], Parameter(nam
 
 remote_edit = Group.create_ordered('Remote Editing')
 
-@app.command(group=remote_edit)
+@command(group=remote_edit)
 def edit(
     path: Optional[Path] = None, /, *,
     editor: Annotated[Optional[str], Parameter(alias='-e')] = None,
-    mount_point: Annotated[Optional[ResolvedDirectory], Parameter(name='--point', alias='-p')] = None
+    mount_point: MountPointOption = None
 ):
     """
     Mount the current challenge locally onto the given mount point, and open the given path in the given editor.
@@ -555,52 +573,7 @@ def edit(
     from .editor import init_editor
     init_editor(editor, path, mount_point)
 
-@app.command(alias='agy', group=remote_edit)
-def antigravity(
-    path: Optional[Path] = None, /, *,
-    mount_point: Annotated[Optional[ResolvedDirectory], Parameter(name='--point', alias='-p')] = None
-):
-    """
-    Mount the current challenge locally and open it in Google Antigravity.
-
-    Args:
-        path (Optional[Path]): The path to open, relative to the mount point.
-        mount_point (Optional[ResolvedDirectory]): Path of the mount point.
-    """
-    from .editor import init_editor
-    init_editor('Google Antigravity', path, mount_point)
-
-@app.command(group=remote_edit)
-def codeedit(
-    path: Optional[Path] = None, /, *,
-    mount_point: Annotated[Optional[ResolvedDirectory], Parameter(name='--point', alias='-p')] = None
-):
-    """
-    Mount the current challenge locally and open it in CodeEdit. (macOS only, very broken)
-
-    Args:
-        path (Optional[Path]): The path to open, relative to the mount point.
-        mount_point (Optional[ResolvedDirectory]): Path of the mount point.
-    """
-    from .editor import init_editor
-    init_editor('CodeEdit', path, mount_point)
-
-@app.command(group=remote_edit)
-def cursor(
-    path: Optional[Path] = None, /, *,
-    mount_point: Annotated[Optional[ResolvedDirectory], Parameter(name='--point', alias='-p')] = None
-):
-    """
-    Mount the current challenge locally and open it in Cursor.
-
-    Args:
-        path (Optional[Path]): The path to open, relative to the mount point.
-        mount_point (Optional[ResolvedDirectory]): Path of the mount point.
-    """
-    from .editor import init_editor
-    init_editor('Cursor', path, mount_point)
-
-@app.command(group=remote_edit)
+@command(group=remote_edit)
 def emacs(path: Optional[Path] = None, /):
     """
     Open a remote directory or file in Emacs.
@@ -611,23 +584,8 @@ def emacs(path: Optional[Path] = None, /):
     from .remote import edit_path
     edit_path('emacs', path)
 
-@app.command(alias='hx', group=remote_edit)
-def helix(
-    path: Optional[Path] = None, /, *,
-    mount_point: Annotated[Optional[ResolvedDirectory], Parameter(name='--point', alias='-p')] = None
-):
-    """
-    Mount the current challenge locally and open it in Helix.
-
-    Args:
-        path (Optional[Path]): The path to open, relative to the mount point.
-        mount_point (Optional[ResolvedDirectory]): Path of the mount point.
-    """
-    from .editor import init_editor
-    init_editor('Helix', path, mount_point)
-
-@app.command(alias='kak', group=remote_edit)
-def kakoune(path: Path, /, *, mount_point: Annotated[Optional[ResolvedDirectory], Parameter(name='--point', alias='-p')] = None):
+@command(alias='kak', group=remote_edit)
+def kakoune(path: Path, /, *, mount_point: MountPointOption = None):
     """
     Mount the current challenge locally and open a mounted file in Kakoune.
 
@@ -638,23 +596,8 @@ def kakoune(path: Path, /, *, mount_point: Annotated[Optional[ResolvedDirectory]
     from .editor import init_editor
     init_editor('Kakoune', path, mount_point)
 
-@app.command(group=remote_edit)
-def lapce(
-    path: Optional[Path] = None, /, *,
-    mount_point: Annotated[Optional[ResolvedDirectory], Parameter(name='--point', alias='-p')] = None
-):
-    """
-    Mount the current challenge locally and open it in Lapce.
-
-    Args:
-        path (Optional[Path]): The path to open, relative to the mount point.
-        mount_point (Optional[ResolvedDirectory]): Path of the mount point.
-    """
-    from .editor import init_editor
-    init_editor('Lapce', path, mount_point)
-
-@app.command(group=remote_edit)
-def micro(path: Path, /, *, mount_point: Annotated[Optional[ResolvedDirectory], Parameter(name='--point', alias='-p')] = None):
+@command(group=remote_edit)
+def micro(path: Path, /, *, mount_point: MountPointOption = None):
     """
     Mount the current challenge locally and open a mounted file in Micro.
 
@@ -665,7 +608,7 @@ def micro(path: Path, /, *, mount_point: Annotated[Optional[ResolvedDirectory],
     from .editor import init_editor
     init_editor('Micro', path, mount_point)
 
-@app.command(group=remote_edit)
+@command(group=remote_edit)
 def nano(path: Path, /):
     """
     Open a remote file in Nano.
@@ -676,7 +619,7 @@ def nano(path: Path, /):
     from .remote import edit_path
     edit_path('nano', path)
 
-@app.command(alias='nvim', group=remote_edit)
+@command(alias='nvim', group=remote_edit)
 def neovim(path: Optional[Path] = None, /):
     """
     Open a remote directory or file in Neovim.
@@ -687,67 +630,7 @@ def neovim(path: Optional[Path] = None, /):
     from .remote import edit_path
     edit_path('nvim', path)
 
-@app.command(group=remote_edit)
-def pycharm(
-    path: Optional[Path] = None, /, *,
-    mount_point: Annotated[Optional[ResolvedDirectory], Parameter(name='--point', alias='-p')] = None
-):
-    """
-    Mount the current challenge locally and open it in PyCharm.
-
-    Args:
-        path (Optional[Path]): The path to open, relative to the mount point.
-        mount_point (Optional[ResolvedDirectory]): Path of the mount point.
-    """
-    from .editor import init_editor
-    init_editor('PyCharm', path, mount_point)
-
-@app.command(alias='subl', group=remote_edit)
-def sublime(
-    path: Optional[Path] = None, /, *,
-    mount_point: Annotated[Optional[ResolvedDirectory], Parameter(name='--point', alias='-p')] = None
-):
-    """
-    Mount the current challenge locally and open it in Sublime Text.
-
-    Args:
-        path (Optional[Path]): The path to open, relative to the mount point.
-        mount_point (Optional[ResolvedDirectory]): Path of the mount point.
-    """
-    from .editor import init_editor
-    init_editor('Sublime Text', path, mount_point)
-
-@app.command(alias='mate', group=remote_edit)
-def textmate(
-    path: Optional[Path] = None, /, *,
-    mount_point: Annotated[Optional[ResolvedDirectory], Parameter(name='--point', alias='-p')] = None
-):
-    """
-    Mount the current challenge locally and open it in TextMate.
-
-    Args:
-        path (Optional[Path]): The path to open, relative to the mount point.
-        mount_point (Optional[ResolvedDirectory]): Path of the mount point.
-    """
-    from .editor import init_editor
-    init_editor('TextMate', path, mount_point)
-
-@app.command(group=remote_edit)
-def theia(
-    path: Optional[Path] = None, /, *,
-    mount_point: Annotated[Optional[ResolvedDirectory], Parameter(name='--point', alias='-p')] = None
-):
-    """
-    Mount the current challenge locally and open it in Eclipse Theia. (macOS only for now)
-
-    Args:
-        path (Optional[Path]): The path to open, relative to the mount point.
-        mount_point (Optional[ResolvedDirectory]): Path of the mount point.
-    """
-    from .editor import init_editor
-    init_editor('Eclipse Theia', path, mount_point)
-
-@app.command(alias='vi', group=remote_edit)
+@command(alias='vi', group=remote_edit)
 def vim(path: Optional[Path] = None, /):
     """
     Open a remote directory or file in Vim.
@@ -758,52 +641,45 @@ def vim(path: Optional[Path] = None, /):
     from .remote import edit_path
     edit_path('vim', path)
 
-@app.command(alias='code', group=remote_edit)
-def vscode(
-    path: Optional[Path] = None, /, *,
-    mount_point: Annotated[Optional[ResolvedDirectory], Parameter(name='--point', alias='-p')] = None
-):
-    """
-    Mount the current challenge locally and open it in Visual Studio Code.
+MOUNT_EDITORS = (
+    ('antigravity', 'agy', 'Google Antigravity', ''),
+    ('codeedit', None, 'CodeEdit', ' (macOS only, very broken)'),
+    ('cursor', None, 'Cursor', ''),
+    ('helix', 'hx', 'Helix', ''),
+    ('lapce', None, 'Lapce', ''),
+    ('pycharm', None, 'PyCharm', ''),
+    ('sublime', 'subl', 'Sublime Text', ''),
+    ('textmate', 'mate', 'TextMate', ''),
+    ('theia', None, 'Eclipse Theia', ' (macOS only for now)'),
+    ('vscode', 'code', 'Visual Studio Code', ''),
+    ('vscodium', 'codium', 'VSCodium', ''),
+    ('windsurf', 'surf', 'Windsurf', '')
+)
 
-    Args:
-        path (Optional[Path]): The path to open, relative to the mount point.
-        mount_point (Optional[ResolvedDirectory]): Path of the mount point.
-    """
-    from .editor import init_editor
-    init_editor('Visual Studio Code', path, mount_point)
+def mount_editor_command(name: str, editor: str, note: str):
+    """Create a command that mounts the current challenge locally and opens it in the given editor."""
+    def open_editor(
+        path: Optional[Path] = None, /, *,
+        mount_point: MountPointOption = None
+    ):
+        from .editor import init_editor
+        init_editor(editor, path, mount_point)
 
-@app.command(alias='codium', group=remote_edit)
-def vscodium(
-    path: Optional[Path] = None, /, *,
-    mount_point: Annotated[Optional[ResolvedDirectory], Parameter(name='--point', alias='-p')] = None
-):
-    """
-    Mount the current challenge locally and open it in VSCodium.
+    open_editor.__name__ = open_editor.__qualname__ = name
+    open_editor.__doc__ = f"""
+    Mount the current challenge locally and open it in {editor}.{note}
 
     Args:
         path (Optional[Path]): The path to open, relative to the mount point.
         mount_point (Optional[ResolvedDirectory]): Path of the mount point.
     """
-    from .editor import init_editor
-    init_editor('VSCodium', path, mount_point)
-
-@app.command(alias='surf', group=remote_edit)
-def windsurf(
-    path: Optional[Path] = None, /, *,
-    mount_point: Annotated[Optional[ResolvedDirectory], Parameter(name='--point', alias='-p')] = None
-):
-    """
-    Mount the current challenge locally and open it in Windsurf.
+    return open_editor
 
-    Args:
-        path (Optional[Path]): The path to open, relative to the mount point.
-        mount_point (Optional[ResolvedDirectory]): Path of the mount point.
-    """
-    from .editor import init_editor
-    init_editor('Windsurf', path, mount_point)
+for name, alias, editor, note in MOUNT_EDITORS:
+    globals()[name] = command(alias=alias, group=remote_edit)(mount_editor_command(name, editor, note))
+del name, alias, editor, note
 
-@app.command(group=remote_edit)
+@command(group=remote_edit)
 def zed(*,
     install: Annotated[bool, Parameter(alias='-i')] = False,
     use_lang_servers: Annotated[bool, Parameter(name='--lang-server', alias='-l')] = False,
@@ -823,18 +699,18 @@ def zed(*,
 
 challenge_help = Group.create_ordered('Challenge Help')
 
-@app.command(group=challenge_help)
+@command(group=challenge_help)
 def discord():
     """Show the link to the pwn.college Discord server."""
     from .log import info
     from .terminal import apply_style
     info(f'Click {apply_style('https://discord.gg/pwncollege')} to go to the Discord server or copy the link and paste it into your browser.')
 
-@app.command(group=challenge_help)
+@command(group=challenge_help)
 def hint(*,
-    dojo_id: Annotated[Optional[str], Parameter(name='--dojo', alias='-d')] = None,
-    module_id: Annotated[Optional[str], Parameter(name='--module', alias='-m')] = None,
-    challenge_id: Annotated[Optional[str], Parameter(name='--challenge', alias='-c')] = None
+    dojo_id: DojoOption = None,
+    module_id: ModuleOption = None,
+    challenge_id: ChallengeOption = None
 ):
     """
     Show a hint for a challenge's flag.
@@ -850,9 +726,9 @@ def hint(*,
     from .challenge import show_hint
     show_hint(dojo_id, module_id, challenge_id)
 
-@app.command(group=challenge_help)
+@command(group=challenge_help)
 def sensai(*,
-    simple: Annotated[bool, Parameter(alias='-s')] = False,
+    simple: SimpleOption = False,
     timeout: Annotated[float, Parameter(alias='-t')] = DEFAULT_SENSAI_TIMEOUT
 ):
     """
@@ -867,12 +743,12 @@ def sensai(*,
 
 flag_submit = Group.create_ordered('Flag Submission')
 
-@app.command(alias='submit', group=flag_submit)
+@command(alias='submit', group=flag_submit)
 def solve(*,
     flag: Annotated[Optional[str], Parameter(alias='-f')] = None,
-    dojo_id: Annotated[Optional[str], Parameter(name='--dojo', alias='-d')] = None,
-    module_id: Annotated[Optional[str], Parameter(name='--module', alias='-m')] = None,
-    challenge_id: Annotated[Optional[str], Parameter(name='--challenge', alias='-c')] = None
+    dojo_id: DojoOption = None,
+    module_id: ModuleOption = None,
+    challenge_id: ChallengeOption = None
 ):
     """
     Submit a flag for a challenge. Warns if flag is for wrong user or challenge.
@@ -891,7 +767,7 @@ def solve(*,
 
 cli_config = Group.create_ordered('CLI Configuration')
 
-@app.command(group=cli_config)
+@command(group=cli_config)
 def config(*, show_default: Annotated[bool, Parameter(name='--default', alias='-d')] = False):
     """
     Show the current configuration settings.
@@ -904,7 +780,7 @@ def config(*, show_default: Annotated[bool, Parameter(name='--default', alias='-
 
 cli_help = Group.create_ordered('CLI Help')
 
-@app.command(alias='trogon', group=cli_help)
+@command(alias='trogon', group=cli_help)
 def help():
     """Start a TUI to explore command documentation for the CLI. Press `^q` to quit."""
     from .tui import init_trogon
@@ -3,14 +3,29 @@
 import errno
 import mfusepy as fuse
 from pathlib import Path
+import posixpath
 from paramiko.channel import Channel
 from paramiko.client import AutoAddPolicy, SSHClient
 from paramiko.sftp_client import SFTPClient
+import shlex
+import shutil
 import stat
-from typing import Optional
+import sys
+import tarfile
+from typing import BinaryIO, Optional
 
 from .config import load_user_config
 
+BUFFER_SIZE = 1024 * 1024
+
+def get_stream_failure(channel: Channel) -> int:
+    """Relay the remote stderr of a broken tar stream and return a nonzero status without blocking on the remote command."""
+
+    while channel.recv_stderr_ready():
+        sys.stderr.buffer.write(channel.recv_stderr(BUFFER_SIZE))
+    sys.stderr.flush()
+    return (channel.recv_exit_status() if channel.exit_status_ready() else 0) or 1
+
 class RemoteClient(fuse.Operations):
     """
     A simple SFTP filesystem.
@@ -28,7 +43,7 @@ class RemoteClient(fuse.Operations):
         self.ssh = SSHClient()
         self.ssh.load_system_host_keys()
         self.ssh.set_missing_host_key_policy(AutoAddPolicy())
-        self.ssh.connect(hostname, port, username, key_filename=str(key_filename))
+        self.ssh.connect(hostname, port, username, key_filename=str(key_filename), compress=ssh_config['Compression'])
         self.sftp: SFTPClient = self.ssh.open_sftp()
         self.sftp.chdir(str(self.project_path))
         self.use_ns = True
@@ -70,6 +85,20 @@ class RemoteClient(fuse.Operations):
     def get_channel(self) -> Channel:
         return self.ssh.get_transport().open_session()
 
+    def get_tree(self, remotepath: str, localpath: str) -> int:
+        """Download a directory as a single tar stream over one channel, instead of one SFTP round trip per file."""
+
+        remotepath = posixpath.join(self.sftp.normalize('.'), remotepath)
+        Path(localpath).mkdir(parents=True, exist_ok=True)
+        with self.get_channel() as channel:
+            channel.exec_command(shlex.join(['tar', '-cf', '-', '-C', remotepath, '.']))
+            try:
+                with tarfile.open(fileobj=channel.makefile('rb'), mode='r|') as tar:
+                    tar.extractall(localpath, filter='data')
+            except (tarfile.ReadError, OSError):
+                return get_stream_failure(channel)
+            return channel.recv_exit_status()
+
     @fuse.overrides(fuse.Operations)
     def getattr(self, path: str, fh: Optional[int] = None):
         try:
@@ -95,17 +124,19 @@ class RemoteClient(fuse.Operations):
         except FileNotFoundError:
             return -1
 
-    def is_dir(self, path: str) -> bool:
+    def get_mode(self, path: str) -> int:
+        """Return the mode of a remote path from a single stat, or 0 if it does not exist."""
+
         try:
-            return stat.S_ISDIR(self.sftp.stat(path).st_mode)
+            return self.sftp.stat(path).st_mode or 0
         except FileNotFoundError:
-            return False
+            return 0
+
+    def is_dir(self, path: str) -> bool:
+        return stat.S_ISDIR(self.get_mode(path))
 
     def is_file(self, path: str) -> bool:
-        try:
-            return stat.S_ISREG(self.sftp.stat(path).st_mode)
-        except FileNotFoundError:
-            return False
+        return stat.S_ISREG(self.get_mode(path))
 
     def listdir(self, path: str) -> list[str]:
         if self.is_dir(path):
@@ -128,14 +159,38 @@ class RemoteClient(fuse.Operations):
     def put(self, localpath: str, remotepath: str):
         self.sftp.put(localpath, remotepath)
 
+    def put_tree(self, localpath: str, remotepath: str) -> int:
+        """Upload a directory as a single tar stream over one channel, instead of one SFTP round trip per file."""
+
+        remotepath = shlex.quote(posixpath.join(self.sftp.normalize('.'), remotepath))
+        with self.get_channel() as channel:
+            channel.exec_command(f'mkdir -p {remotepath} && tar -xf - -C {remotepath}')
+            stdin = channel.makefile('wb')
+            try:
+                with tarfile.open(fileobj=stdin, mode='w|') as tar:
+                    tar.add(localpath, arcname='.')
+                stdin.flush()
+            except OSError:
+                return get_stream_failure(channel)
+            channel.shutdown_write()
+            return channel.recv_exit_status()
+
     @fuse.overrides(fuse.Operations)
     def read(self, path: str, size: int, offset: int, fh: int) -> bytes:
         with self.sftp.open(path) as f:
             f.seek(offset, 0)
             return f.read(size)
 
+    def read_into(self, path: str, fileobj: BinaryIO):
+        """Copy a remote file into a local file object in BUFFER_SIZE chunks; paramiko still buffers prefetched data until read."""
+
+        with self.sftp.open(path, bufsize=BUFFER_SIZE) as f:
+            f.prefetch()
+            shutil.copyfileobj(f, fileobj, BUFFER_SIZE)
+
     def read_bytes(self, path: str) -> bytes:
-        with self.sftp.open(path) as f:
+        with self.sftp.open(path, bufsize=BUFFER_SIZE) as f:
+            f.prefetch()
             return f.read()
 
     @fuse.overrides(fuse.Operations)
@@ -190,7 +245,8 @@ class RemoteClient(fuse.Operations):
             return len(data)
 
     def write_bytes(self, path: str, data: bytes) -> int:
-        with self.sftp.open(path, 'w') as f:
+        with self.sftp.open(path, 'w', BUFFER_SIZE) as f:
+            f.set_pipelined()
             f.write(data)
             return len(data)
 
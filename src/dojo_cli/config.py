@@ -1,6 +1,7 @@
 """Handles configuration. Configuration file can be either JSON or YAML for now, might add TOML later."""
 
 from copy import deepcopy
+from functools import cache
 import json
 import os
 from pathlib import Path
@@ -9,7 +10,7 @@ import sys
 from rich import print as rprint
 import yaml
 
-from .constants import SSH_HOME, XDG_CACHE_HOME, XDG_CONFIG_HOME, XDG_DATA_HOME
+from .constants import DEFAULT_CONFIG_PATH, SSH_HOME, XDG_CACHE_HOME, XDG_DATA_HOME
 
 DEFAULT_CONFIG = {
     'api': '/pwncollege_api/v1',
@@ -25,6 +26,7 @@ DEFAULT_CONFIG = {
     },
     'cookie_path': str(XDG_CACHE_HOME.expanduser() / 'dojo-cli' / 'cookie.json'),
     'editor': 'Visual Studio Code',
+    'http_cache_path': str(XDG_CACHE_HOME.expanduser() / 'dojo-cli' / 'http'),
     'log_styles': {
         'error': 'on red',
         'fail': 'b red',
@@ -61,6 +63,7 @@ DEFAULT_CONFIG = {
         'IdentityFile': str(SSH_HOME.expanduser() / 'id_ed25519'),
         'ServerAliveInterval': 20,
         'ServerAliveCountMax': 3,
+        'Compression': True,
         'config_file': str(SSH_HOME.expanduser() / 'config'),
         'mount_point': str(XDG_DATA_HOME.expanduser() / 'dojo-cli' / 'mnt'),
         'project_path': '/home/hacker'
@@ -74,10 +77,6 @@ DEFAULT_CONFIG = {
     }
 }
 
-DEFAULT_CONFIG_PATH = XDG_CONFIG_HOME / 'dojo-cli' / 'config'
-
-user_config = {}
-
 def load_config(config_path: Path):
     config_path = config_path.expanduser().resolve()
     if config_path.is_dir():
@@ -104,14 +103,12 @@ def deepmerge(dst_dict: dict, src_dict: dict) -> dict:
             final_dict[key] = deepcopy(src_dict[key])
     return final_dict
 
+@cache
 def load_user_config() -> dict:
-    """Load user config from config path, then deep merge it with default config."""
+    """Load user config from config path, then deep merge it with default config. Call load_user_config.cache_clear() to reload."""
 
-    global user_config
-    if not user_config:
-        config_path = Path(os.getenv('DOJO_CONFIG', DEFAULT_CONFIG_PATH))
-        user_config = deepmerge(DEFAULT_CONFIG, load_config(config_path))
-    return user_config
+    config_path = Path(os.getenv('DOJO_CONFIG', DEFAULT_CONFIG_PATH))
+    return deepmerge(DEFAULT_CONFIG, load_config(config_path))
 
 def show_config(show_default: bool = False):
     rprint(json.dumps(DEFAULT_CONFIG if show_default else load_user_config(), indent=4))
@@ -14,3 +14,5 @@ XDG_BIN_HOME = Path(os.getenv('XDG_BIN_HOME', '~/.local/bin'))
 XDG_CACHE_HOME = Path(os.getenv('XDG_CACHE_HOME', '~/.cache'))
 XDG_CONFIG_HOME = Path(os.getenv('XDG_CONFIG_HOME', '~/.config'))
 XDG_DATA_HOME = Path(os.getenv('XDG_DATA_HOME', '~/.local/share'))
+
+DEFAULT_CONFIG_PATH = XDG_CONFIG_HOME / 'dojo-cli' / 'config'
@@ -1,17 +1,24 @@
 """Handles HTTP requests and responses."""
 
+import hashlib
 import json
 import os
 from pathlib import Path
 import re
+import time
 from typing import Optional, cast
 
 from itsdangerous import URLSafeTimedSerializer
-from niquests import Session
+from niquests import RetryConfiguration, Session
 
 from .config import load_user_config
 from .log import error
 
+DOJOS_CACHE_TTL = 10 * 60
+POOL_CONNECTIONS = 4
+POOL_MAXSIZE = 16
+CSRF_NONCE_PATTERN = re.compile(r''''csrfNonce': "([^"]+)"''')
+
 session_cache: Optional[Session] = None
 cookie_cache: Optional[dict] = None
 cookie_cache_path: Optional[Path] = None
@@ -20,7 +27,11 @@ cookie_cache_mtime: Optional[int] = None
 def get_session() -> Session:
     global session_cache
     if session_cache is None:
-        session_cache = Session()
+        session_cache = Session(
+            retries=RetryConfiguration(connect=2, read=0),
+            pool_connections=POOL_CONNECTIONS,
+            pool_maxsize=POOL_MAXSIZE
+        )
     return session_cache
 
 def clear_cookie_cache():
@@ -80,6 +91,22 @@ def deserialize_auth_token(auth_token: str) -> Optional[list[int | str]]:
                 return token_data
     return None
 
+def get_csrf_nonce(session: Session, base_url: str, headers: dict) -> str:
+    csrf_response = session.get(base_url, headers=headers, allow_redirects=False)
+    if csrf_response.is_redirect:
+        error('Session expired, please login again.')
+    nonce = CSRF_NONCE_PATTERN.search(cast(str, csrf_response.text))
+    if not nonce:
+        error('Failed to extract nonce.')
+        raise RuntimeError('unreachable')
+    return nonce.group(1)
+
+def resolve_url(url: str, api: bool = True) -> str:
+    if url.startswith('http://') or url.startswith('https://'):
+        return url
+    user_config = load_user_config()
+    return user_config['base_url'] + (user_config['api'] if api else '') + url
+
 def request(url: str, api: bool = True, auth: bool = True, csrf: bool = False, **kwargs):
     user_config = load_user_config()
     session = kwargs.pop('session', None)
@@ -88,9 +115,9 @@ def request(url: str, api: bool = True, auth: bool = True, csrf: bool = False, *
     method = kwargs.pop('method', 'POST' if 'data' in kwargs or 'json' in kwargs else 'GET')
     base_url = user_config['base_url']
     headers = dict(kwargs.pop('headers', {}))
+    cookie_jar = None
 
-    if not (url.startswith('http://') or url.startswith('https://')):
-        url = base_url + (user_config['api'] if api else '') + url
+    url = resolve_url(url, api)
 
     if auth:
         dojo_auth_token = os.getenv('DOJO_AUTH_TOKEN', '')
@@ -103,17 +130,18 @@ def request(url: str, api: bool = True, auth: bool = True, csrf: bool = False, *
         else:
             error('Request is not authorized, please login or run this in the dojo.')
 
+    # The nonce lives as long as the session, so keep it in the cookie jar instead of fetching a page per request
+    nonce_cached = False
     if csrf:
-        csrf_response = session.get(base_url, headers=headers, allow_redirects=False)
-        if csrf_response.is_redirect:
-            error('Session expired, please login again.')
-        nonce = re.search(r''''csrfNonce': "([^"]+)"''', cast(str, csrf_response.text))
-        if nonce:
-            headers['CSRF-Token'] = nonce.group(1)
-            if 'data' in kwargs:
-                kwargs['data']['nonce'] = nonce.group(1)
-        else:
-            error('Failed to extract nonce.')
+        nonce = cookie_jar.get('nonce') if cookie_jar else None
+        nonce_cached = nonce is not None
+        if not nonce_cached:
+            nonce = get_csrf_nonce(session, base_url, headers)
+            if cookie_jar:
+                save_cookie(cookie_jar | {'nonce': nonce})
+        headers['CSRF-Token'] = nonce
+        if 'data' in kwargs:
+            kwargs['data']['nonce'] = nonce
 
     if 'json' in kwargs:
         headers['Content-Type'] = 'application/json'
@@ -123,8 +151,80 @@ def request(url: str, api: bool = True, auth: bool = True, csrf: bool = False, *
         if auth:
             kwargs.setdefault('allow_redirects', False)
         response = session.request(method, url, headers=headers, **kwargs)
+        if nonce_cached and response.status_code == 403:
+            nonce = get_csrf_nonce(session, base_url, headers)
+            save_cookie(cast(dict, cookie_jar) | {'nonce': nonce})
+            headers['CSRF-Token'] = nonce
+            if isinstance(kwargs.get('data'), dict):
+                kwargs['data']['nonce'] = nonce
+            response = session.request(method, url, headers=headers, **kwargs)
     except Exception as e:
         error(f'Request failed: {e}')
     if auth and response.is_redirect:
         error('Session expired, please login again.')
     return response
+
+def get_cached_account_id() -> Optional[int]:
+    """Return the account ID kept in the cookie jar, or None if it is not there yet or an auth token is in use."""
+
+    cookie_path = Path(load_user_config()['cookie_path']).expanduser().resolve()
+    if deserialize_auth_token(os.getenv('DOJO_AUTH_TOKEN', '')) or not cookie_path.is_file():
+        return None
+    account_id = get_cached_cookie(cookie_path).get('account_id')
+    return account_id if isinstance(account_id, int) else None
+
+def get_account_id() -> Optional[int]:
+    """Return the ID of the logged in account, keeping it in the cookie jar next to the session it belongs to."""
+
+    account_id = get_cached_account_id()
+    if account_id is not None:
+        return account_id
+
+    account_id = request('/users/me').json().get('id')
+    cookie_path = Path(load_user_config()['cookie_path']).expanduser().resolve()
+    if account_id is not None and not deserialize_auth_token(os.getenv('DOJO_AUTH_TOKEN', '')) and cookie_path.is_file():
+        save_cookie(get_cached_cookie(cookie_path) | {'account_id': account_id})
+    return account_id
+
+def request_json_cached(url: str, ttl: float, api: bool = True, **kwargs):
+    """
+    Send an unauthenticated GET request and return its JSON body, caching the body on disk.
+    A cached body younger than ttl seconds is returned without any request, an older one is revalidated with its ETag.
+    """
+
+    cache_dir = Path(load_user_config()['http_cache_path']).expanduser().resolve()
+    cache_key = json.dumps([resolve_url(url, api), kwargs.get('params')], sort_keys=True)
+    cache_path = cache_dir / f'{hashlib.sha256(cache_key.encode()).hexdigest()}.json'
+    headers = dict(kwargs.pop('headers', {}))
+
+    cached = None
+    if cache_path.is_file():
+        try:
+            cached = json.loads(cache_path.read_text())
+        except json.JSONDecodeError:
+            pass
+        else:
+            if time.time() - cache_path.stat().st_mtime < ttl:
+                return cached['data']
+            if cached.get('etag'):
+                headers['If-None-Match'] = cached['etag']
+
+    response = request(url, api, False, headers=headers, **kwargs)
+    # The response is already in hand, so a cache that cannot be written is not worth failing over
+    if cached is not None and response.status_code == 304:
+        try:
+            cache_path.touch()
+        except OSError:
+            pass
+        return cached['data']
+
+    data = response.json()
+    if response.ok:
+        try:
+            cache_dir.mkdir(0o755, True, True)
+            temp_path = cache_path.with_suffix(f'.{os.getpid()}.tmp')
+            temp_path.write_text(json.dumps({'etag': response.headers.get('ETag'), 'data': data}))
+            temp_path.replace(cache_path)
+        except OSError:
+            pass
+    return data
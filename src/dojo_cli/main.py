@@ -0,0 +1,115 @@
+"""This is the entry point of the dojo console script. It answers help and version requests before loading the CLI."""
+
+import hashlib
+import json
+import os
+from pathlib import Path
+import shutil
+import sys
+from typing import Optional
+
+from .constants import XDG_CACHE_HOME
+
+HELP_CACHE_DIR = XDG_CACHE_HOME.expanduser() / 'dojo-cli' / 'help'
+HELP_ENV_VARS = ('COLORTERM', 'FORCE_COLOR', 'NO_COLOR', 'TERM', 'TTY_COMPATIBLE', 'TTY_INTERACTIVE', 'XDG_CONFIG_HOME')
+HELP_FLAGS = ('--help', '-h')
+VERSION_FLAGS = ('--version',)
+
+# Commands without parameters, mapped to the handler call of their body in cli.py, so they can skip loading cyclopts
+# Run scripts/check_direct_commands.py after changing any of these commands in either file
+DIRECT_COMMANDS = {
+    'connect': ('remote', 'run_cmd', ()),
+    'keygen': ('remote', 'ssh_keygen', ()),
+    'logout': ('user', 'do_logout', ()),
+    'ps': ('challenge', 'show_status', ()),
+    'settings': ('user', 'change_settings', ()),
+    'status': ('challenge', 'show_status', ()),
+    'stop': ('challenge', 'stop_challenge', ()),
+    'tmux': ('remote', 'run_cmd', ('tmux -l',)),
+    'ttv': ('video', 'init_twitch', ()),
+    'twitch': ('video', 'init_twitch', ()),
+    'zellij': ('remote', 'run_cmd', ('zellij',))
+}
+
+def get_help_tokens(args: list[str]) -> Optional[list[str]]:
+    """Return the command tokens of a help request, or None if the arguments do something other than print help."""
+
+    if not args or (len(args) == 1 and args[0] in HELP_FLAGS):
+        return []
+    if len(args) == 2 and args[1] in HELP_FLAGS and not args[0].startswith('-'):
+        return args[:1]
+    return None
+
+def get_help_cache_path(tokens: list[str]) -> Path:
+    """The cached page depends on the CLI source and cyclopts version, the requested command, and everything rich uses to lay out and color it."""
+
+    from importlib.metadata import PackageNotFoundError, version
+
+    try:
+        cyclopts_version = version('cyclopts')
+    except PackageNotFoundError:
+        cyclopts_version = None
+
+    cli_mtime = Path(__file__).with_name('cli.py').stat().st_mtime_ns
+    terminal_width = shutil.get_terminal_size().columns
+    terminal_env = [os.getenv(name) for name in HELP_ENV_VARS]
+    cache_key = json.dumps([cli_mtime, cyclopts_version, tokens, terminal_width, sys.stdout.isatty(), terminal_env])
+    return HELP_CACHE_DIR / f'{hashlib.sha256(cache_key.encode()).hexdigest()}.txt'
+
+def prune_help_cache():
+    """Remove pages rendered before the CLI source was last changed, since their cache keys can never match again."""
+
+    cli_mtime = Path(__file__).with_name('cli.py').stat().st_mtime_ns
+    for cache_path in HELP_CACHE_DIR.glob('*.txt'):
+        if cache_path.stat().st_mtime_ns < cli_mtime:
+            cache_path.unlink(True)
+
+def print_help(tokens: list[str]):
+    help_cache_path = get_help_cache_path(tokens)
+    if help_cache_path.is_file():
+        sys.stdout.write(help_cache_path.read_text())
+        sys.stdout.flush()
+        return
+
+    from rich.console import Console
+    from .cli import app
+
+    console = Console(record=True)
+    app.help_print(tokens, console=console)
+
+    # The page has already been printed, so a cache that cannot be written is not worth failing over
+    try:
+        HELP_CACHE_DIR.mkdir(0o755, True, True)
+        prune_help_cache()
+        temp_path = help_cache_path.with_suffix(f'.{os.getpid()}.tmp')
+        temp_path.write_text(console.export_text(styles=console.is_terminal))
+        temp_path.replace(help_cache_path)
+    except OSError:
+        pass
+
+def print_version():
+    from importlib.metadata import PackageNotFoundError, version
+
+    try:
+        print(version('dojo-cli'))
+    except PackageNotFoundError:
+        print('0.0.0')
+
+def run_direct_command(name: str):
+    from importlib import import_module
+
+    module_name, function_name, args = DIRECT_COMMANDS[name]
+    getattr(import_module(f'.{module_name}', __package__), function_name)(*args)
+
+def main():
+    args = sys.argv[1:]
+    tokens = get_help_tokens(args)
+    if tokens is not None:
+        return print_help(tokens)
+    if len(args) == 1 and args[0] in VERSION_FLAGS:
+        return print_version()
+    if len(args) == 1 and args[0] in DIRECT_COMMANDS:
+        return run_direct_command(args[0])
+
+    from .cli import app
+    return app(args)
@@ -4,8 +4,9 @@ import os
 from pathlib import Path
 import select
 import shlex
-from shutil import which
+from shutil import copyfileobj, which
 import signal
+import stat
 import subprocess
 import sys
 import termios
@@ -112,7 +113,8 @@ def print_file(path: Path):
         elif not os.access(path, os.R_OK):
             error(f'Permission to read {apply_style(path)} denied.')
 
-        sys.stdout.buffer.write(path.read_bytes())
+        with path.open('rb') as f:
+            copyfileobj(f, sys.stdout.buffer)
         sys.stdout.buffer.flush()
 
     else:
@@ -126,7 +128,7 @@ def print_file(path: Path):
             error(f'{apply_style(path)} is not an existing file.')
 
         try:
-            sys.stdout.buffer.write(client.read_bytes(str(path)))
+            client.read_into(str(path), sys.stdout.buffer)
             sys.stdout.buffer.flush()
         except PermissionError:
             error(f'Permission to read {apply_style(path)} denied.')
@@ -151,6 +153,13 @@ def edit_path(editor: str, path: Optional[Path] = None):
 
         run_cmd(shlex.join([editor, str(path)]) if path else editor)
 
+def exec_process(args: list):
+    """Replace the CLI process with an interactive one, since there is nothing left to do after it exits."""
+
+    sys.stdout.flush()
+    sys.stderr.flush()
+    os.execv(args[0], list(map(os.fspath, args)))
+
 def run_openssh(
     command: Optional[str] = None,
     capture_output: bool = False,
@@ -294,6 +303,8 @@ def run_cmd(
     """Run a command on the remote server. If capture_output is True, the standard out bytes are returned."""
 
     if client_type == 'local' or 'DOJO_AUTH_TOKEN' in os.environ:
+        if not capture_output and payload is None:
+            exec_process(['/bin/sh', '-c', command or 'bash'])
         completed_process = subprocess.run(command or 'bash', shell=True, capture_output=capture_output, input=payload)
         if capture_output:
             return completed_process.stdout
@@ -313,8 +324,10 @@ def download_file(remote_path: Path, local_path: Optional[Path] = None, log_succ
         error('No active challenge session; start a challenge!')
 
     client = get_remote_client()
-    if not client.is_file(str(remote_path)):
-        error('Remote path is not a file.')
+    remote_mode = client.get_mode(str(remote_path))
+    is_dir = stat.S_ISDIR(remote_mode)
+    if not is_dir and not stat.S_ISREG(remote_mode):
+        error('Remote path is not a file or directory.')
 
     if not local_path:
         local_path = Path.cwd()
@@ -324,7 +337,10 @@ def download_file(remote_path: Path, local_path: Optional[Path] = None, log_succ
     if local_path.is_dir():
         local_path /= remote_path.name
 
-    client.get(str(remote_path), str(local_path))
+    if not is_dir:
+        client.get(str(remote_path), str(local_path))
+    elif client.get_tree(str(remote_path), str(local_path)):
+        error(f'Failed to download {remote_path}.')
 
     if log_success:
         success(f'Downloaded {remote_path} to {local_path}')
@@ -337,20 +353,26 @@ def upload_file(local_path: Path, remote_path: Optional[Path] = None, log_succes
 
     local_path = local_path.expanduser().resolve()
 
-    if not local_path.is_file():
-        error('Provided path is not a file.')
+    if not local_path.is_file() and not local_path.is_dir():
+        error('Provided path is not a file or directory.')
 
     if not remote_path:
         remote_path = Path(load_user_config()['ssh']['project_path'])
 
     client = get_remote_client()
-    if not client.is_file(str(remote_path)):
-        if client.is_dir(str(remote_path)):
+    remote_mode = client.get_mode(str(remote_path))
+    if local_path.is_dir():
+        if stat.S_ISDIR(remote_mode):
+            remote_path /= local_path.name
+        if client.put_tree(str(local_path), str(remote_path)):
+            error(f'Failed to upload {local_path}.')
+    else:
+        if stat.S_ISDIR(remote_mode):
             remote_path /= local_path.name
-        elif not client.is_dir(str(remote_path.parent)):
+        elif not stat.S_ISREG(remote_mode) and not client.is_dir(str(remote_path.parent)):
             client.makedirs(str(remote_path.parent))
 
-    client.put(str(local_path), str(remote_path))
+        client.put(str(local_path), str(remote_path))
 
     if log_success:
         success(f'Uploaded {local_path} to {remote_path}')
@@ -6,11 +6,13 @@ import re
 
 from .config import load_user_config
 
+EMAIL_PATTERN = re.compile(r'^[\w\-\.]+@([\w\-]+\.)+[\w\-]{2,4}$')
+
 def apply_style(obj):
     object_styles = load_user_config()['object_styles']
 
     if isinstance(obj, str):
-        if re.match(r'^[\w\-\.]+@([\w\-]+\.)+[\w\-]{2,4}$', obj):
+        if EMAIL_PATTERN.match(obj):
             style = f'{object_styles['email']} link=mailto:{obj}'
         elif obj.startswith('http://') or obj.startswith('https://'):
             style = f'{object_styles['url']} link={obj}'
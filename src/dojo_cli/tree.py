@@ -8,7 +8,7 @@ from textual.widgets import Button, Footer, Label, Markdown, MarkdownViewer, Tre
 from typing import Optional
 
 from .http import request
-from .challenge import DOJO_IDS
+from .challenge import DOJO_IDS, get_dojo_modules, get_dojo_modules_by_id, get_dojos
 from .utils import fix_markdown_links
 
 ROOT_LABEL = 'k/up: move up, j/down: move down, space: toggle, enter: select, ctrl+p: palette, ctrl+q: quit'
@@ -93,7 +93,7 @@ class TreeApp(App):
         super().__init__()
         self.auth = auth
         self.loaded_modules = set()
-        dojos = request('/dojos', auth=self.auth).json().get('dojos')
+        dojos = get_dojos(self.auth)
         sorted_dojos = sorted(filter(lambda dojo: dojo['id'] in DOJO_IDS, dojos), key=lambda dojo: DOJO_IDS.index(dojo['id']))
         sorted_dojos += sorted(filter(lambda dojo: dojo['id'] not in DOJO_IDS, dojos), key=lambda dojo: dojo['id'])
 
@@ -107,7 +107,7 @@ class TreeApp(App):
         elif not module_id:
             dojo = next(filter(lambda dojo: dojo['id'] == dojo_id, sorted_dojos))
             self.data = {dojo_id: {'data': dojo, 'modules': {}}}
-            modules = request(f'/dojos/{dojo_id}/modules', auth=auth).json().get('modules')
+            modules = get_dojo_modules(dojo_id, auth)
             for module in modules:
                 self.data[dojo['id']]['modules'][module['id']] = {'data': module, 'unified_items': {}}
                 for item in module['unified_items']:
@@ -117,8 +117,7 @@ class TreeApp(App):
         elif not challenge_id:
             dojo = next(filter(lambda dojo: dojo['id'] == dojo_id, sorted_dojos))
             self.data = {dojo_id: {'data': dojo, 'modules': {}}}
-            modules = request(f'/dojos/{dojo_id}/modules', auth=auth).json().get('modules')
-            module = next(filter(lambda module: module['id'] == module_id, modules))
+            module = get_dojo_modules_by_id(dojo_id, auth)[module_id]
             self.data[dojo['id']]['modules'][module['id']] = {'data': module, 'unified_items': {}}
             for item in module['unified_items']:
                 self.data[dojo['id']]['modules'][module['id']]['unified_items'][item['id']] = {'data': item}
@@ -127,8 +126,7 @@ class TreeApp(App):
         else:
             dojo = next(filter(lambda dojo: dojo['id'] == dojo_id, sorted_dojos))
             self.data = {dojo_id: {'data': dojo, 'modules': {}}}
-            modules = request(f'/dojos/{dojo_id}/modules', auth=auth).json().get('modules')
-            module = next(filter(lambda module: module['id'] == module_id, modules))
+            module = get_dojo_modules_by_id(dojo_id, auth)[module_id]
             self.data[dojo['id']]['modules'][module['id']] = {'data': module, 'unified_items': {}}
             for item in module['unified_items']:
                 if item['item_type'] == 'resource' or item['item_type'] == 'challenge' and item['id'] == challenge_id:
@@ -169,7 +167,7 @@ class TreeApp(App):
         dojo_id = dojo_data['id']
         if dojo_id in self.loaded_modules:
             return
-        modules = request(f'/dojos/{dojo_id}/modules', auth=self.auth).json().get('modules')
+        modules = get_dojo_modules(dojo_id, self.auth)
         for module in modules:
             module_data = {'data': module, 'unified_items': {}}
             for item in module['unified_items']:
@@ -1,7 +1,9 @@
 """Handles user login and data."""
 
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
 from getpass import getpass
+from itertools import islice
 import re
 from typing import Optional
 
@@ -9,11 +11,16 @@ from bs4 import BeautifulSoup
 from niquests import Session
 from rich import print as rprint
 from rich.table import Table
+from rich.text import Text
 
 from .config import load_user_config
-from .http import delete_cookie, request, save_cookie
+from .http import delete_cookie, request, request_json_cached, save_cookie
 from .log import error, fail, info, success
-from .utils import can_render_image, download_image, get_belt_hex, show_table
+from .utils import can_render_image, download_image, download_images, get_belt_hex, show_table
+
+ALERT_PATTERN = re.compile(r'<div class=".*" role="alert">\s+<span>(.*)</span>')
+BELTS_CACHE_TTL = 10 * 60
+SCOREBOARD_CACHE_TTL = 60
 
 def get_session_cookie(session: Session) -> str:
     for cookie in session.cookies:
@@ -33,7 +40,7 @@ def do_register(username: Optional[str] = None, email: Optional[str] = None, pas
     with Session() as session:
         credentials = {'name': username, 'email': email, 'password': password, 'commitment_verified': 'verified'}
         response = request('/register', False, False, True, session=session, data=credentials)
-        errors = re.findall(r'<div class=".*" role="alert">\s+<span>(.*)</span>', response.text)
+        errors = ALERT_PATTERN.findall(response.text)
 
         if errors:
             for error_msg in errors:
@@ -51,7 +58,7 @@ def do_login(username: Optional[str] = None, password: Optional[str] = None):
     with Session() as session:
         credentials = {'name': username, 'password': password}
         response = request('/login', False, False, True, session=session, data=credentials)
-        errors = re.findall(r'<div class=".*" role="alert">\s+<span>(.*)</span>', response.text)
+        errors = ALERT_PATTERN.findall(response.text)
 
         if errors:
             for error_msg in errors:
@@ -91,6 +98,12 @@ def change_settings():
         else:
             error(str(response['errors']))
 
+def parse_score(score: str) -> tuple[int, int, int, int]:
+    """Pick the rank, solves, challenge count and user count out of a colon separated score."""
+
+    fields = score.split(':')
+    return int(fields[0]), int(fields[1]), int(fields[2]), int(fields[5])
+
 def get_rank(num):
     rank_style = load_user_config()['object_styles']['rank']
     return '🥇🥈🥉'[num - 1] if num < 4 else f'[{rank_style}]{num}[/]'
@@ -101,13 +114,15 @@ def show_me(simple: bool = False):
     if not me.ok:
         error(account.get('error', 'Unknown error'))
 
-    score = request('/score', auth=False, params={'username': account['name']})
-    fields = list(map(int, score.json().split(':')))
+    with ThreadPoolExecutor(2) as executor:
+        score_future = executor.submit(request, '/score', auth=False, params={'username': account['name']})
+        belts_future = executor.submit(request_json_cached, '/belts', BELTS_CACHE_TTL)
 
-    belt_data = request('/belts', auth=False).json()['users'].get(str(account['id']), {})
+    rank, solves, challenges, users = parse_score(score_future.result().json())
+    belt_data = belts_future.result()['users'].get(str(account['id']), {})
     belt_hex = get_belt_hex(belt_data.get('color', 'white'))
 
-    account['rank'] = f'[b green]{get_rank(fields[0])}/{fields[5]}[/]'
+    account['rank'] = f'[b green]{get_rank(rank)}/{users}[/]'
     account['handle'] = f'[b {belt_hex}]{account['name']}[/]'
     if not simple and can_render_image():
         account['belt'] = download_image(f'/belt/{belt_data['color']}.svg')
@@ -115,7 +130,7 @@ def show_me(simple: bool = False):
         account['belt'] = f'[b {belt_hex}]{belt_data['color'].title()}[/]'
     account['country'] = ''.join(chr(ord(c) + ord('🇦') - ord('A')) for c in account['country'])
     account['date_ascended'] = datetime.fromisoformat(belt_data['date'])
-    account['score'] = f'[b cyan]{fields[1]}/{fields[2]}[/]'
+    account['score'] = f'[b cyan]{solves}/{challenges}[/]'
 
     info(f'You are the epic hacker [b green]{account['name']}[/]!')
     keys = ['rank', 'id', 'handle', 'belt', 'email', 'website', 'affiliation', 'country', 'bracket', 'date_ascended', 'score']
@@ -129,13 +144,12 @@ def show_score(username: Optional[str] = None):
         else:
             error(me.json().get('error', 'Unknown error'))
 
-    score = request('/score', auth=False, params={'username': username}).json()
-    fields = list(map(int, score.split(':')))
+    rank, solves, challenges, users = parse_score(request('/score', auth=False, params={'username': username}).json())
 
     show_table({
-        'rank': f'[b green]{get_rank(fields[0])}/{fields[5]}[/]',
+        'rank': f'[b green]{get_rank(rank)}/{users}[/]',
         'handle': f'[b green]{username}[/]',
-        'score': f'[b cyan]{fields[1]}/{fields[2]}[/]'
+        'score': f'[b cyan]{solves}/{challenges}[/]'
     }, 'Global ranking')
 
 def show_activity(user_id: Optional[int] = None):
@@ -182,8 +196,8 @@ def get_wechall_rankings(page: int = 1, simple: bool = False):
     render_image = not simple and can_render_image()
     wechall_html = request(f'https://www.wechall.net/site/ranking/for/104/pwn_college/page-{page}', auth=False)
     soup = BeautifulSoup(wechall_html.text, 'html.parser')
-    images = {}
     wechall_data = []
+    flag_urls = []
 
     for tr in soup.find_all('tr')[2:]:
         tds = tr.find_all('td')
@@ -191,32 +205,33 @@ def get_wechall_rankings(page: int = 1, simple: bool = False):
 
         img_alt = tds[1].img['alt'] if tds[1].img else ''
         country = 'Unknown' if img_alt == '__Unknown Country' else img_alt
-        if render_image:
-            if country not in images:
-                img_src = str(tds[1].img['src']) if tds[1].img else ''
-                images[country] = download_image('https://www.wechall.net' + img_src)
-            row['country'] = images[country]
-        else:
-            row['country'] = f'[b]{country}[/]'
+        row['country'] = f'[b]{country}[/]'
+        flag_urls.append('https://www.wechall.net' + (str(tds[1].img['src']) if tds[1].img else ''))
 
         row['username'] = f'[b]{tds[2].string}[/]'
         row['score'] = int(tds[3].string or 0)
         row['percentage'] = f'[b cyan]{tds[4].string}[/]'
         wechall_data.append(row)
 
+    if render_image:
+        images = download_images(flag_urls)
+        for row, flag_url in zip(wechall_data, flag_urls):
+            row['country'] = images[flag_url]
+
     return wechall_data
 
 def show_scoreboard(dojo_id: Optional[str] = None, module_id: Optional[str] = None, duration: str = 'all', page: int = 1, simple: bool = False):
     if dojo_id:
         durations = {'week': 7, 'month': 30, 'all': 0}
         endpoint = f'/scoreboard/{dojo_id}/{module_id or '_'}/{durations.get(duration.lower(), 0)}/{page}'
-        standings = request(endpoint, auth=False).json().get('standings')
-        images = {}
+        standings = request_json_cached(endpoint, SCOREBOARD_CACHE_TTL).get('standings')
         render_image = not simple and can_render_image()
+        if render_image:
+            images = download_images(url for row in standings for url in (row['belt'], row['symbol']))
 
         for row in standings:
-            belt = row['belt'].split('/')[-1].split('.')[0]
-            symbol = row['symbol'].split('/')[-1].split('.')[0]
+            belt = row['belt'].rpartition('/')[2].partition('.')[0]
+            symbol = row['symbol'].rpartition('/')[2].partition('.')[0]
             belt_hex = get_belt_hex(belt)
 
             row['rank'] = get_rank(row['rank'])
@@ -224,13 +239,8 @@ def show_scoreboard(dojo_id: Optional[str] = None, module_id: Optional[str] = No
             row['badges'] = ''.join(sorted(badge['emoji'] for badge in row['badges']))
 
             if render_image:
-                if belt not in images:
-                    images[belt] = download_image(row['belt'])
-                row['belt'] = images[belt]
-
-                if symbol not in images:
-                    images[symbol] = download_image(row['symbol'])
-                row['role'] = images[symbol]
+                row['belt'] = images[row['belt']]
+                row['role'] = images[row['symbol']]
             else:
                 row['belt'] = f'[b {belt_hex}]{belt.title()}[/]'
                 row['role'] = 'ASU Student' if symbol == 'fork' else symbol.title()
@@ -242,49 +252,45 @@ def show_scoreboard(dojo_id: Optional[str] = None, module_id: Optional[str] = No
         show_table(get_wechall_rankings(page, simple), 'WeChall rankings')
 
 def show_belts(belt: Optional[str] = None, page: Optional[int] = None, simple: bool = False):
-    response = request('/belts', auth=False).json()
+    if page is not None and page < 0:
+        error('Page number must not be negative.')
 
-    render_image = not simple and can_render_image()
-    if render_image:
-        if belt in response['ranks']:
-            images = {belt: download_image(f'/belt/{belt}.svg')}
-        else:
-            images = {belt: download_image(f'/belt/{belt}.svg') for belt in response['ranks']}
+    response = request_json_cached('/belts', BELTS_CACHE_TTL)
 
-    belts = []
     if belt in response['ranks']:
-        belt_hex = get_belt_hex(belt)
-        title = f'[b {belt_hex}]Belted Hackers[/]'
-        for rank, id in enumerate(response['ranks'][belt]):
-            user = response['users'][str(id)]
-            user['rank'] = f'[b green]{get_rank(rank + 1)}/{len(response['ranks'][belt])}[/]'
-            user['id'] = id
-            user['handle'] = f'[b {belt_hex}]{user['handle']}[/]'
-            if render_image:
-                user['belt'] = images[belt]
-            else:
-                user['belt'] = f'[b {belt_hex}]{user['color'].title()}[/]'
-            user['website'] = user['site']
-            user['date_ascended'] = user['date']
-            user['date_ascended'] = datetime.fromisoformat(user['date'])
-            belts.append(user)
-
+        title = f'[b {get_belt_hex(belt)}]Belted Hackers[/]'
+        ranked_users = [(id, response['users'][str(id)]) for id in response['ranks'][belt]]
     else:
+        belt = None
         title = '[b]Belted Hackers[/]'
-        for rank, (id, user) in enumerate(response['users'].items()):
-            belt_hex = get_belt_hex(user['color'])
-            user['rank'] = f'[b green]{get_rank(rank + 1)}/{len(response['users'])}[/]'
-            user['id'] = int(id)
-            user['handle'] = f'[b {belt_hex}]{user['handle']}[/]'
-            if render_image:
-                user['belt'] = images[user['color']]
-            else:
-                user['belt'] = f'[b {belt_hex}]{user['color'].title()}[/]'
-            user['website'] = user['site']
-            user['date_ascended'] = datetime.fromisoformat(user['date'])
-            belts.append(user)
+        ranked_users = [(int(id), user) for id, user in response['users'].items()]
 
+    # Only style the rows on the requested page, and only download the belts they show
+    rows = enumerate(ranked_users)
     if page is not None:
-        belts = belts[page * 20:][:20]
+        rows = islice(rows, page * 20, page * 20 + 20)
+    rows = list(rows)
+
+    render_image = not simple and can_render_image()
+    if render_image:
+        images = download_images(f'/belt/{belt or user['color']}.svg' for _, (_, user) in rows)
+
+    # Build the cells as Text, so handles are not parsed as markup and each belt style string is shared
+    belt_styles = {}
+    belts = []
+    for rank, (id, user) in rows:
+        color = belt or user['color']
+        if color not in belt_styles:
+            belt_styles[color] = f'b {get_belt_hex(color)}'
+        user['rank'] = f'[b green]{get_rank(rank + 1)}/{len(ranked_users)}[/]'
+        user['id'] = id
+        user['handle'] = Text(user['handle'], belt_styles[color])
+        if render_image:
+            user['belt'] = images[f'/belt/{color}.svg']
+        else:
+            user['belt'] = Text(user['color'].title(), belt_styles[color])
+        user['website'] = user['site']
+        user['date_ascended'] = datetime.fromisoformat(user['date'])
+        belts.append(user)
 
     show_table(belts, title, ['rank', 'id', 'handle', 'belt', 'website', 'date_ascended'])
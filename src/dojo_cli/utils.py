@@ -1,6 +1,7 @@
 """Utility functions for the pwn.college dojo CLI."""
 
 from cairosvg import svg2png
+from concurrent.futures import ThreadPoolExecutor
 from functools import lru_cache
 from io import BytesIO
 import os
@@ -8,12 +9,14 @@ import re
 from rich import box, print as rprint
 from rich.table import Column, Table
 from rich.text import Text
-from typing import Any, Optional
+from typing import Any, Iterable, Optional
 
 from .config import load_user_config
 from .http import request
 from .terminal import apply_style
 
+DOWNLOAD_WORKERS = 8
+
 if os.getenv('TERM_PROGRAM') not in ['Apple_Terminal']:
     from textual_image.renderable import Image, SixelImage, TGPImage
 
@@ -67,3 +70,10 @@ def download_image(url: str, height: int = 1):
         url = base_url + url
     image = download_image_bytes(url)
     return Image(BytesIO(image), 'auto', height)
+
+def download_images(urls: Iterable[str], height: int = 1) -> dict:
+    """Download several images concurrently, returning a dict mapping each unique URL to its image."""
+
+    unique_urls = list(dict.fromkeys(urls))
+    with ThreadPoolExecutor(DOWNLOAD_WORKERS) as executor:
+        return dict(zip(unique_urls, executor.map(lambda url: download_image(url, height), unique_urls)))
@@ -8,7 +8,7 @@ import yt_dlp
 
 from .config import load_user_config
 from .constants import UNAME_SYSTEM
-from .http import request
+from .http import DOJOS_CACHE_TTL, request, request_json_cached
 from .install import homebrew_install, nanobrew_install, wax_install, zerobrew_install
 from .log import error
 from .utils import can_render_image, download_image, show_table
@@ -116,7 +116,7 @@ def init_youtube(
         play_youtube(video_id, playlist_id)
 
     elif dojo_id is not None and module_id is not None and resource_id is not None:
-        modules = request(f'/dojos/{dojo_id}/modules', auth=False).json().get('modules')
+        modules = request_json_cached(f'/dojos/{dojo_id}/modules', DOJOS_CACHE_TTL).get('modules')
         module = next(filter(lambda module: module['id'] == module_id, modules))
         resource = next(filter(lambda resource: resource['id'] == resource_id, module['resources']))
         if resource['type'] == 'lecture':